@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'schedule_manage.settings')
 
 application = get_asgi_application()
+
+# 只在提供服务的进程中预热智能输入解析器
+from user.services.pool import warm_up_services  # noqa: E402
+
+warm_up_services()
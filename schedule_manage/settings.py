@@ -89,6 +89,42 @@ DATABASES = {
     }
 }
 
+# 智能调度：求解器（auto / greedy / branch_and_bound / genetic）
+SCHEDULER_SOLVER = 'auto'
+# 遗传算法适应度计算方式（serial / thread / process）及并发数，None 表示使用全部 CPU 核心
+SCHEDULER_BACKEND = 'serial'
+SCHEDULER_WORKERS = None
+
+# 智能输入：服务进程（wsgi.py / asgi.py）启动时在后台预加载 jiagu 模型与解析器；
+# 关闭时由首次解析或首次状态查询触发加载
+SCHEDULE_PARSER_WARMUP = True
+# 智能输入批量模式单次最多解析的条数
+SMART_INPUT_BATCH_LIMIT = 200
+# 智能输入解析结果缓存：MAXSIZE 为进程内 LRU 容量，TTL 为过期秒数（None 表示不过期），
+# BACKEND 为 CACHES 中的别名，配置后各 worker 共享缓存；设为 None 关闭缓存
+SCHEDULE_PARSE_CACHE = {
+    'MAXSIZE': 2048,
+    'TTL': 6 * 60 * 60,
+    'BACKEND': None,
+}
+# 智能输入分阶段耗时统计：SAMPLE_RATE 为抽样计时的解析占比，0 或 None 表示关闭
+SCHEDULE_PARSER_PROFILING = {
+    'SAMPLE_RATE': 0.01,
+}
+# 智能输入解析进程池：WORKERS 为 0 时在请求线程内解析；MAX_PENDING 为排队上限，超过立即返回 503；
+# TIMEOUT 为单个请求等待解析结果的秒数
+SMART_INPUT_POOL = {
+    'WORKERS': 0,
+    'MAX_PENDING': 16,
+    'TIMEOUT': 5,
+}
+# 群组列表（getGroupList）按用户缓存，成员或群组信息变化时由 user.signals 清除；
+# 默认的本地内存缓存只能清除当前进程的条目，多进程部署时应指向共享缓存，TTL 兜底
+GROUP_INFO_CACHE = {
+    'BACKEND': 'default',
+    'TTL': 10 * 60,
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -41,11 +41,14 @@ urlpatterns = [
     path('api/deleteMember/', views.delete_team_member),
 
     path('api/smart_input/', views.smart_input),
+    path('api/smart_input/status/', views.smart_input_status),
     path('api/audio_path_upload/', views.recognize_audio),
     path('api/addSchedule/', views.add_schedule),
     path('api/adjustSchedule/', views.adjust_schedule),
 
     path('api/getSchedule/', views.get_schedule),
+    path('api/getCalendar/', views.get_calendar),
+    path('api/sync/', views.sync),
     path('api/updateSchedule/', views.update_schedule),
     path('api/updateTeamSchedule/', views.update_team_schedule),
     path('api/deleteSchedule/', views.delete_schedule),
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'schedule_manage.settings')
 
 application = get_wsgi_application()
+
+# 只在提供服务的进程中预热智能输入解析器
+from user.services.pool import warm_up_services  # noqa: E402
+
+warm_up_services()
@@ -0,0 +1,169 @@
+"""智能输入解析基准测试。
+
+    python -m user.benchmarks.parser --output parser.json
+    python -m user.benchmarks.parser --baseline parser.json
+
+从语料文件读取带标准答案的文本，在固定的参考时间下解析，输出吞吐量、端到端延迟、
+各阶段耗时（来自 ScheduleParser 的计时钩子）、峰值内存以及 user.services.test.evaluate_all
+给出的准确率（JSON）。指定 --baseline 时，任何一项准确率低于基线都会以非零状态退出，
+避免提速的同时悄悄降低准确率。
+
+    python -m user.benchmarks.parser --write-corpus 500
+
+重新生成语料文件：test.py 中的手写用例加上指定数量的合成用例。
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'schedule_manage.settings')
+django.setup()
+
+from user.benchmarks.scheduler import percentile  # noqa: E402
+from user.benchmarks.workload import generate_parse_cases  # noqa: E402
+from user.services.cache import ParseCache  # noqa: E402
+from user.services.parser import ScheduleParser  # noqa: E402
+from user.services.profiling import StageProfiler  # noqa: E402
+from user.services.test import (REFERENCE_NOW, build_test_cases, dump_test_cases, evaluate_all,  # noqa: E402
+                                load_test_cases)
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), 'data', 'parser_cases.json')
+
+# 与基线比较的准确率指标
+ACCURACY_KEYS = (
+    ("time", "accuracy"),
+    ("content", "exact_match"),
+    ("content", "action_verb_correct"),
+    ("resource", "f1"),
+    ("overall", "perfect_match"),
+)
+
+
+def latency_summary(samples):
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "total_ms": sum(samples) * 1000,
+    }
+
+
+def accuracy_summary(metrics, total):
+    return {
+        "cases": total,
+        "time": {"accuracy": metrics["time"]["accuracy"]},
+        "content": {
+            "exact_match": metrics["content"]["exact_match"] / total,
+            "action_verb_correct": metrics["content"]["action_verb_correct"] / total,
+        },
+        "resource": {key: metrics["resource"][key] for key in ("precision", "recall", "f1")},
+        "overall": {
+            "perfect_match": metrics["overall"]["perfect_match"] / total,
+            "avg_errors": metrics["overall"]["avg_errors"],
+        },
+    }
+
+
+def run(cases, now, repeat, use_cache):
+    parser = ScheduleParser(cache=ParseCache() if use_cache else None)
+    texts = [text for text, _ in cases]
+
+    # 预热一遍，jiagu 的模型与词典在首次调用时才完全加载
+    for text in texts:
+        parser.parse(text, "benchmark", now=now)
+    if parser.cache is not None:
+        parser.cache.clear()
+    parser.tier_counts.clear()
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            began = time.perf_counter()
+            parser.parse(text, "benchmark", now=now)
+            latencies.append(time.perf_counter() - began)
+    elapsed = time.perf_counter() - started
+
+    # 各阶段耗时由解析器自身的计时钩子统计（全量抽样），不计入上面的吞吐量
+    parser.profiler = StageProfiler(sample_rate=1.0)
+    for text in texts:
+        parser.parse(text, "benchmark", now=now)
+    profile = parser.profiler.snapshot()
+    parser.profiler = None
+
+    tracemalloc.start()
+    for text in texts:
+        parser.parse(text, "benchmark", now=now)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    metrics = evaluate_all(parser, cases, now)
+    return {
+        "throughput": len(latencies) / elapsed if elapsed else None,
+        "latency": latency_summary(latencies),
+        "stages": profile["stages"],
+        "peak_memory_kb": peak / 1024,
+        "tiers": dict(parser.tier_counts),
+        "cache": parser.cache.stats() if parser.cache is not None else None,
+        "accuracy": accuracy_summary(metrics, len(cases)),
+        "failures": [case for case in metrics["case_details"] if case["errors"]],
+    }
+
+
+def accuracy_regressions(report, baseline):
+    regressions = []
+    for group, key in ACCURACY_KEYS:
+        current = report["accuracy"][group][key]
+        previous = baseline["accuracy"][group][key]
+        if current < previous - 1e-9:
+            regressions.append({"metric": f"{group}.{key}", "baseline": previous, "current": current})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--cache', action='store_true', help="启用解析结果缓存")
+    parser.add_argument('--baseline', help="上一次运行输出的 JSON，用于检查准确率是否下降")
+    parser.add_argument('--write-corpus', type=int, metavar='N', help="重新生成语料文件（含 N 条合成用例）后退出")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="结果 JSON 文件，缺省输出到标准输出")
+    args = parser.parse_args(argv)
+
+    if args.write_corpus is not None:
+        cases = build_test_cases(REFERENCE_NOW) + generate_parse_cases(args.write_corpus, REFERENCE_NOW, args.seed)
+        dump_test_cases(args.corpus, REFERENCE_NOW, cases)
+        return
+
+    now, cases = load_test_cases(args.corpus)
+    report = {
+        "benchmark": "parser",
+        "config": vars(args),
+        "corpus": {"path": args.corpus, "cases": len(cases), "reference_now": str(now)},
+        **run(cases, now, args.repeat, args.cache),
+    }
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            report["regressions"] = accuracy_regressions(report, json.load(f))
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output + "\n")
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
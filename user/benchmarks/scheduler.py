@@ -0,0 +1,174 @@
+"""调度算法基准测试。
+
+    python -m user.benchmarks.scheduler --sizes 100 1000 10000 100000 --output bench.json
+
+对冲突检测、适应度计算、各求解器以及端到端的 adjust_schedule 分别计时，
+输出吞吐量、p50/p99 延迟、峰值内存和最终惩罚值（JSON）。
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from zoneinfo import ZoneInfo
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'schedule_manage.settings')
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from user import views  # noqa: E402
+from user.models import Schedule  # noqa: E402
+from user.resource.fitness import ScheduleTable, vectorized_fitness  # noqa: E402
+from user.resource.interval_index import ScheduleIndex  # noqa: E402
+from user.resource.scheduler import RESCHEDULE_HORIZON, affected_component, check_conflicts  # noqa: E402
+from user.resource.solvers import SOLVERS, solve  # noqa: E402
+from user.benchmarks.workload import generate_probes, generate_schedules  # noqa: E402
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def summarize(name, size, latencies, peak_memory, **extra):
+    total = sum(latencies)
+    return {
+        "benchmark": name,
+        "size": size,
+        "ops": len(latencies),
+        "throughput": len(latencies) / total if total else None,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_memory_kb": peak_memory / 1024,
+        **extra,
+    }
+
+
+def measure(operation, inputs):
+    latencies, outputs = [], []
+    for item in inputs:
+        started = time.perf_counter()
+        outputs.append(operation(item))
+        latencies.append(time.perf_counter() - started)
+    # 峰值内存单独跑一遍，避免 tracemalloc 拖慢计时
+    tracemalloc.start()
+    operation(inputs[0])
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return latencies, outputs, peak
+
+
+def in_window(schedules, probe):
+    start, end = probe.startTime - RESCHEDULE_HORIZON, probe.endTime + RESCHEDULE_HORIZON
+    return [
+        s for s in schedules
+        if (s.executor == probe.executor or s.resource == probe.resource) and s.startTime < end and s.endTime > start
+    ]
+
+
+def bench_conflicts(schedules, probes):
+    results = []
+    latencies, _, peak = measure(ScheduleIndex, [schedules])
+    results.append(summarize("index_build", len(schedules), latencies, peak))
+    index = ScheduleIndex(schedules)
+    latencies, _, peak = measure(lambda probe: check_conflicts(index, probe), probes)
+    results.append(summarize("conflict_check", len(schedules), latencies, peak))
+    return results
+
+
+def bench_fitness(schedules, repeat):
+    table = ScheduleTable(schedules)
+    latencies, scores, peak = measure(lambda _: table.score(), list(range(repeat)))
+    return [summarize("fitness", len(schedules), latencies, peak, penalty=-scores[0])]
+
+
+def bench_solvers(schedules, probes, solvers):
+    results = []
+    components = [affected_component(in_window(schedules, probe), probe)[0] for probe in probes]
+    for solver in solvers:
+        latencies, outputs, peak = measure(
+            lambda case: solve(case[0], case[1], solver=solver, seed=0), list(zip(components, probes)))
+        penalties = [-vectorized_fitness(output) for output in outputs]
+        results.append(summarize(f"solve_{solver}", len(schedules), latencies, peak,
+                                 penalty=sum(penalties) / len(penalties)))
+    return results
+
+
+def bench_adjust_schedule(schedules, probes):
+    # 在临时测试库中导入日程，通过视图函数走完整的 adjust_schedule 流程
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        Schedule.objects.bulk_create(schedules, batch_size=1000)
+        factory = RequestFactory()
+        shanghai = ZoneInfo("Asia/Shanghai")
+
+        def adjust(probe):
+            body = {
+                "class": "personal",
+                "content": probe.scheduleContent,
+                "startTime": probe.startTime.replace(tzinfo=shanghai).timestamp(),
+                "endTime": probe.endTime.replace(tzinfo=shanghai).timestamp(),
+                "resource": probe.resource,
+                "executor": probe.executor,
+                "priority": probe.priority,
+            }
+            request = factory.post('/api/adjustSchedule/', json.dumps(body), content_type='application/json')
+            return views.adjust_schedule(request).status_code
+
+        latencies, statuses, peak = measure(adjust, probes)
+        return [summarize("adjust_schedule", len(schedules), latencies, peak,
+                          success_rate=statuses.count(200) / len(statuses))]
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def run(sizes, probes_per_size, density, executors, resources, priority_mix, solvers, end_to_end, seed):
+    results = []
+    for size in sizes:
+        options = dict(density=density, executors=executors, resources=resources, priority_mix=priority_mix)
+        schedules = generate_schedules(size, seed=seed, **options)
+        probes = generate_probes(probes_per_size, size, seed=seed + 1, **options)
+
+        results += bench_conflicts(schedules, probes)
+        results += bench_fitness(schedules, repeat=5)
+        results += bench_solvers(schedules, probes, solvers)
+        if end_to_end:
+            results += bench_adjust_schedule(generate_schedules(size, seed=seed, with_ids=False, **options), probes)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--probes', type=int, default=50)
+    parser.add_argument('--density', type=float, default=4)
+    parser.add_argument('--executors', type=int, default=20)
+    parser.add_argument('--resources', type=int, default=10)
+    parser.add_argument('--priority-mix', type=float, nargs=3, default=[0.3, 0.5, 0.2])
+    parser.add_argument('--solvers', nargs='+', default=sorted(SOLVERS), choices=sorted(SOLVERS))
+    parser.add_argument('--no-end-to-end', dest='end_to_end', action='store_false')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="结果 JSON 文件，缺省输出到标准输出")
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "scheduler",
+        "config": vars(args),
+        "results": run(args.sizes, args.probes, args.density, args.executors, args.resources,
+                       tuple(args.priority_mix), args.solvers, args.end_to_end, args.seed),
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == '__main__':
+    main()
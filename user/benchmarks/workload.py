@@ -0,0 +1,94 @@
+import random
+from datetime import datetime, timedelta
+
+from user.models import Schedule
+
+BASE_DATE = datetime(2025, 5, 12)
+
+
+def span_days(size, density, executors):
+    return max(1, round(size / (executors * density)))
+
+
+def generate_schedules(size, density=4, executors=20, resources=10, priority_mix=(0.3, 0.5, 0.2),
+                       seed=0, days=None, model=Schedule, with_ids=True, **fields):
+    """生成合成日程集。
+
+    density 为每个执行人每天的平均日程数，resources 为资源种类数（0 表示不占用资源），
+    priority_mix 为优先级 1/2/3 的占比。时间落在 8:00 - 20:00 的 15 分钟网格上。
+    """
+    rng = random.Random(seed)
+    days = days or span_days(size, density, executors)
+    resource_names = [f"资源{i}" for i in range(resources)]
+    schedules = []
+    for i in range(size):
+        day = BASE_DATE + timedelta(days=rng.randrange(days))
+        start = day + timedelta(minutes=15 * rng.randint(8 * 4, 20 * 4 - 1))
+        schedules.append(model(
+            id=i + 1 if with_ids else None,
+            executor=f"u{rng.randrange(executors)}",
+            scheduleContent=f"任务{i}",
+            startTime=start,
+            endTime=start + timedelta(minutes=15 * rng.randint(1, 8)),
+            resource=rng.choice(resource_names) if resource_names else None,
+            priority=rng.choices((1, 2, 3), weights=priority_mix)[0],
+            state=0,
+            **fields,
+        ))
+    return schedules
+
+
+def generate_probes(count, size, density=4, executors=20, resources=10, priority_mix=(0.3, 0.5, 0.2),
+                    seed=1, model=Schedule):
+    # 与日程集同分布、落在同一时间跨度内的待插入新日程
+    return generate_schedules(count, density, executors, resources, priority_mix, seed=seed,
+                              days=span_days(size, density, executors), model=model, with_ids=False)
+
+
+PARSE_DATES = [
+    ("今天", 0), ("明天", 1), ("后天", 2), ("大后天", 3),
+    ("下周一", "next:0"), ("下周三", "next:2"), ("下周五", "next:4"), ("下周日", "next:6"),
+]
+PARSE_TIMES = [
+    ("上午9点", (9, 0), None), ("上午10点半", (10, 30), None), ("下午3点", (15, 0), None),
+    ("下午两点", (14, 0), None), ("晚上8点", (20, 0), None), ("14:30", (14, 30), None),
+    ("下午3点-5点", (15, 0), (17, 0)), ("上午9点到11点", (9, 0), (11, 0)),
+]
+PARSE_LOCATIONS = ["", "会议室", "实验室", "图书馆", "报告厅", "体育馆", "食堂"]
+PARSE_ACTIONS = [
+    ("准备", "项目评审材料"), ("提交", "季度报告"), ("讨论", "项目进展"), ("审核", "财务报表"),
+    ("部署", "新版系统"), ("参加", "部门例会"), ("编写", "接口文档"), ("测试", "支付功能"),
+    ("培训", "新员工"), ("拜访", "合作客户"), ("整理", "会议纪要"), ("评估", "市场调研结果"),
+]
+
+
+def generate_parse_cases(count, now, seed=0):
+    """生成带标准答案的智能输入语料。
+
+    每条文本由日期、时间、地点、动作几部分拼成，期望值按 now 直接推算，
+    与解析器的实现无关，可用来衡量解析准确率。
+    """
+    rng = random.Random(seed)
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    cases = []
+    for _ in range(count):
+        date_text, offset = rng.choice(PARSE_DATES)
+        time_text, start, end = rng.choice(PARSE_TIMES)
+        location = rng.choice(PARSE_LOCATIONS)
+        verb, target = rng.choice(PARSE_ACTIONS)
+
+        if isinstance(offset, str):
+            weekday = int(offset.split(":")[1])
+            offset = weekday - now.weekday() + 7
+        day = today + timedelta(days=offset)
+        start_time = day.replace(hour=start[0], minute=start[1])
+        end_time = day.replace(hour=end[0], minute=end[1]) if end else start_time + timedelta(hours=1)
+
+        text = date_text + time_text + (f"在{location}" if location else "") + verb + target
+        cases.append((text, {
+            "startTime": start_time.strftime("%Y-%m-%d %H:%M:%S"),
+            "endTime": end_time.strftime("%Y-%m-%d %H:%M:%S"),
+            "scheduleContent": verb + target,
+            "resource": [location] if location else [],
+        }))
+    return cases
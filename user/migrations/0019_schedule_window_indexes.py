@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0018_alter_groupschedule_resource_alter_schedule_resource'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='groupschedule',
+            index=models.Index(fields=['executor', 'startTime'], name='groupsched_executor_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['executor', 'startTime'], name='schedule_executor_start_idx'),
+        ),
+    ]
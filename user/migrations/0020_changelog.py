@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0019_schedule_window_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=32, verbose_name='模型')),
+                ('objectID', models.BigIntegerField(verbose_name='对象ID')),
+                ('action', models.CharField(choices=[('upsert', '新增或修改'), ('delete', '删除')], max_length=8, verbose_name='操作')),
+                ('username', models.CharField(default=None, max_length=11, null=True, verbose_name='所属用户')),
+                ('groupID', models.CharField(default=None, max_length=8, null=True, verbose_name='所属群组')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['username', 'id'], name='changelog_username_idx'), models.Index(fields=['groupID', 'id'], name='changelog_group_idx')],
+            },
+        ),
+    ]
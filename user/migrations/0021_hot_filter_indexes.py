@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0020_changelog'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['groupID'], name='announcement_group_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groupschedule',
+            index=models.Index(fields=['resource', 'startTime'], name='groupsched_resource_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groupschedule',
+            index=models.Index(fields=['groupID', 'startTime'], name='groupsched_group_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groupschedule',
+            index=models.Index(fields=['groupID', 'executor'], name='groupsched_group_executor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='memo',
+            index=models.Index(fields=['username'], name='memo_username_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['resource', 'startTime'], name='schedule_resource_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(fields=['username', 'groupID'], name='teammember_username_group_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(fields=['groupID', 'username'], name='teammember_group_username_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammemo',
+            index=models.Index(fields=['groupID'], name='teammemo_group_idx'),
+        ),
+    ]
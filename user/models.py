@@ -20,6 +20,14 @@ class Schedule(models.Model):
     priority = models.IntegerField(default=1)  # 任务优先级（1: 低, 2: 中, 3: 高）
     state = models.IntegerField(verbose_name="事件状态", default=0)  # 0是未完成，1是完成
 
+    class Meta:
+        indexes = [
+            # 按执行人取某个时间窗内的日程（日历分页）
+            models.Index(fields=['executor', 'startTime'], name='schedule_executor_start_idx'),
+            # 冲突检测按资源 + 时间窗取候选日程
+            models.Index(fields=['resource', 'startTime'], name='schedule_resource_start_idx'),
+        ]
+
     def __str__(self):
         return self.scheduleContent
 
@@ -34,6 +42,15 @@ class GroupSchedule(models.Model):
     priority = models.IntegerField(default=1)  # 任务优先级（1: 低, 2: 中, 3: 高）
     state = models.IntegerField(verbose_name="事件状态", default=0)  # 0是未完成，1是完成
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['executor', 'startTime'], name='groupsched_executor_start_idx'),
+            models.Index(fields=['resource', 'startTime'], name='groupsched_resource_start_idx'),
+            # 团队日历按群组 + 时间窗；按群组 + 执行人取个人在群内的任务
+            models.Index(fields=['groupID', 'startTime'], name='groupsched_group_start_idx'),
+            models.Index(fields=['groupID', 'executor'], name='groupsched_group_executor_idx'),
+        ]
+
 
 class TeamGroup(models.Model):
     groupID = models.CharField(verbose_name="群ID", primary_key=True, max_length=8, editable=False, unique=True)
@@ -48,6 +65,13 @@ class TeamMember(models.Model):
     memberName = models.CharField(verbose_name="成员名", max_length=64)
     permission = models.IntegerField(verbose_name="权限", default=0)
 
+    class Meta:
+        indexes = [
+            # 取用户所在群组（只读 groupID，可走覆盖索引）；按群组列成员或定位某个成员
+            models.Index(fields=['username', 'groupID'], name='teammember_username_group_idx'),
+            models.Index(fields=['groupID', 'username'], name='teammember_group_username_idx'),
+        ]
+
 
 class Memo(models.Model):
     username = models.CharField( max_length=11,verbose_name='所属用户')
@@ -57,6 +81,11 @@ class Memo(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['username'], name='memo_username_idx'),
+        ]
+
 
 class TeamMemo(models.Model):
     username = models.CharField( max_length=11,verbose_name='创建用户')
@@ -67,6 +96,11 @@ class TeamMemo(models.Model):
     updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
     groupID = models.CharField(verbose_name="所属群组", max_length=8)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['groupID'], name='teammemo_group_idx'),
+        ]
+
 
 class Announcement(models.Model):
     title = models.CharField('标题', max_length=100)
@@ -77,6 +111,32 @@ class Announcement(models.Model):
     last_modified = models.DateTimeField('最后修改时间', auto_now=True)
     groupID = models.CharField(verbose_name="所属群组", max_length=8)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['groupID'], name='announcement_group_idx'),
+        ]
+
+
+class ChangeLog(models.Model):
+    # 自增 id 即同步令牌：客户端记住收到的最大 id，下次只取之后的变更
+    ACTIONS = (
+        ('upsert', '新增或修改'),
+        ('delete', '删除'),
+    )
+
+    model = models.CharField(verbose_name="模型", max_length=32)
+    objectID = models.BigIntegerField(verbose_name="对象ID")
+    action = models.CharField(verbose_name="操作", max_length=8, choices=ACTIONS)
+    username = models.CharField(verbose_name="所属用户", max_length=11, null=True, default=None)
+    groupID = models.CharField(verbose_name="所属群组", max_length=8, null=True, default=None)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['username', 'id'], name='changelog_username_idx'),
+            models.Index(fields=['groupID', 'id'], name='changelog_group_idx'),
+        ]
+
 
 class TimerRecord(models.Model):
     TIMER_TYPES = (
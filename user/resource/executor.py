@@ -0,0 +1,54 @@
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+
+import numpy as np
+
+BACKENDS = ('serial', 'thread', 'process')
+
+_pools = {}
+_pools_lock = Lock()
+
+
+def get_pool(backend, workers=None):
+    # 进程池/线程池按 (类型, 数量) 缓存，在多次请求之间复用
+    workers = workers or os.cpu_count() or 1
+    key = (backend, workers)
+    with _pools_lock:
+        if key not in _pools:
+            if backend == 'thread':
+                _pools[key] = ThreadPoolExecutor(max_workers=workers)
+            else:
+                # 用 spawn 启动：Django 进程中有后台线程（解析器预热、解析池管理），fork 可能继承被持有的锁而死锁
+                _pools[key] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _pools[key], workers
+
+
+@atexit.register
+def shutdown_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+
+def conflict_chunk(table, starts):
+    return [table.conflict_penalty(start) for start in starts]
+
+
+def evaluate_population(table, starts, backend='serial', workers=None):
+    # 返回每个个体的冲突惩罚；时间偏移惩罚是 O(n) 的，由调用方直接计算
+    if backend not in BACKENDS:
+        raise ValueError(f"未知的调度执行方式: {backend}")
+    if backend == 'serial' or len(starts) < 2:
+        return conflict_chunk(table, starts)
+
+    pool, workers = get_pool(backend, workers)
+    # 每个 worker 只收到一份基因表和一块开始时间矩阵，避免逐个体序列化
+    chunks = np.array_split(starts, min(workers, len(starts)))
+    penalties = []
+    for chunk_penalties in pool.map(conflict_chunk, [table] * len(chunks), chunks):
+        penalties.extend(chunk_penalties)
+    return penalties
@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from .interval_index import naive
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+MICROS_PER_SLOT = 15 * 60 * 1_000_000
+
+# 超过该规模时不再构造 n×n 矩阵，改用排序扫描
+DENSE_LIMIT = 1024
+
+
+def to_micros(dt):
+    return (naive(dt) - EPOCH) // MICROSECOND
+
+
+def _encode(values):
+    codes = {}
+    return np.array([codes.setdefault(value, len(codes)) for value in values], dtype=np.int64)
+
+
+def pair_weights(priority, lo, hi):
+    # 与 fitness 一致：下标小者优先级高罚 10，低罚 1，相同罚 5
+    p_lo, p_hi = priority[lo], priority[hi]
+    return np.where(p_lo > p_hi, 10, np.where(p_lo < p_hi, 1, 5))
+
+
+class ScheduleTable:
+    """把一组日程编码成定长的 int64 数组，供向量化的适应度计算使用。
+
+    时间统一去掉时区后以微秒计，执行人与资源编码为整数，
+    没有 original_startTime 的日程不计入时间偏移惩罚。
+    """
+
+    def __init__(self, schedule_list, dense_limit=DENSE_LIMIT):
+        self.size = len(schedule_list)
+        self.dense_limit = dense_limit
+        self.start = np.array([to_micros(s.startTime) for s in schedule_list], dtype=np.int64)
+        self.duration = np.array([to_micros(s.endTime) for s in schedule_list], dtype=np.int64) - self.start
+        self.executor = _encode(s.executor for s in schedule_list)
+        self.resource = _encode(s.resource for s in schedule_list)
+        self.priority = np.array([s.priority for s in schedule_list], dtype=np.int64)
+        self.has_original = np.array([hasattr(s, 'original_startTime') for s in schedule_list], dtype=bool)
+        self.original = np.array([
+            to_micros(s.original_startTime) if hasattr(s, 'original_startTime') else 0
+            for s in schedule_list
+        ], dtype=np.int64)
+        self._weights = None
+        self._neighbors = None
+
+    def __getstate__(self):
+        # 权重矩阵和邻接表可以随时重建，跨进程传递时不必带上
+        state = self.__dict__.copy()
+        state['_weights'] = None
+        state['_neighbors'] = None
+        return state
+
+    @property
+    def weights(self):
+        if self._weights is None:
+            n = self.size
+            lo, hi = np.triu_indices(n, k=1)
+            same = (self.executor[lo] == self.executor[hi]) | (self.resource[lo] == self.resource[hi])
+            weights = np.zeros((n, n), dtype=np.int8)
+            weights[lo, hi] = np.where(same, pair_weights(self.priority, lo, hi), 0)
+            self._weights = weights
+        return self._weights
+
+    @property
+    def neighbors(self):
+        # 执行人或资源相同的日程对（CSR 邻接表），只有它们之间可能产生冲突
+        if self._neighbors is None:
+            n = self.size
+            if n <= self.dense_limit:
+                symmetric = self.weights + self.weights.T
+                rows, cols = np.nonzero(symmetric)
+                weights = symmetric[rows, cols].astype(np.int64)
+            else:
+                pairs = [np.empty(0, dtype=np.int64)]
+                for codes in (self.executor, self.resource):
+                    order = np.argsort(codes, kind='stable')
+                    for group in np.split(order, np.flatnonzero(np.diff(codes[order])) + 1):
+                        if len(group) > 1:
+                            rows, cols = np.repeat(group, len(group)), np.tile(group, len(group))
+                            keep = rows != cols
+                            pairs.append(rows[keep] * n + cols[keep])
+                rows, cols = np.divmod(np.unique(np.concatenate(pairs)), n)
+                weights = pair_weights(self.priority, np.minimum(rows, cols), np.maximum(rows, cols))
+            indptr = np.searchsorted(rows, np.arange(n + 1))
+            self._neighbors = (indptr, cols, weights)
+        return self._neighbors
+
+    def moved_penalty(self, start, moved):
+        # 至少一端属于 moved 的日程对的冲突惩罚之和
+        indptr, cols, weights = self.neighbors
+        first, counts = indptr[moved], indptr[moved + 1] - indptr[moved]
+        total = int(counts.sum())
+        if total == 0:
+            return 0
+        rows = np.repeat(moved, counts)
+        positions = np.repeat(first - (np.cumsum(counts) - counts), counts) + np.arange(total)
+        cols, weights = cols[positions], weights[positions]
+
+        end = start + self.duration
+        overlap = (start[rows] < end[cols]) & (end[rows] > start[cols])
+        in_moved = np.zeros(self.size, dtype=bool)
+        in_moved[moved] = True
+        # 两端都被移动的日程对会被统计两次
+        doubled = np.where(in_moved[cols], 1, 2)
+        return int((weights * doubled)[overlap].sum()) // 2
+
+    def conflict_delta(self, old_start, new_start, moved):
+        return self.moved_penalty(new_start, moved) - self.moved_penalty(old_start, moved)
+
+    def conflict_penalty(self, start):
+        if self.size < 2:
+            return 0
+        end = start + self.duration
+        if self.size <= self.dense_limit:
+            overlap = (start[:, None] < end[None, :]) & (end[:, None] > start[None, :])
+            return int(self.weights[overlap].sum(dtype=np.int64))
+        return self._sweep_penalty(start, end)
+
+    def _sweep_penalty(self, start, end):
+        order = np.argsort(start, kind='stable')
+        s, e = start[order], end[order]
+        n = self.size
+
+        # 排序后，与第 a 个区间可能重叠的只有其后开始时间早于 e[a] 的区间
+        stop = np.searchsorted(s, e, side='left')
+        counts = np.maximum(stop - np.arange(1, n + 1), 0)
+        total = int(counts.sum())
+        if total == 0:
+            return 0
+        left = np.repeat(np.arange(n), counts)
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        right = left + 1 + (np.arange(total) - first)
+
+        keep = s[left] < e[right]
+        i, j = order[left[keep]], order[right[keep]]
+        same = (self.executor[i] == self.executor[j]) | (self.resource[i] == self.resource[j])
+        i, j = i[same], j[same]
+        return int(pair_weights(self.priority, np.minimum(i, j), np.maximum(i, j)).sum(dtype=np.int64))
+
+    def shift_penalty(self, start):
+        shift = np.abs(start - self.original)[self.has_original]
+        return float(shift.sum(dtype=np.int64)) / MICROS_PER_SLOT
+
+    def score(self, start=None):
+        if start is None:
+            start = self.start
+        return -(self.conflict_penalty(start) * 100 + self.shift_penalty(start))
+
+
+def vectorized_fitness(schedule_list):
+    return ScheduleTable(schedule_list).score()
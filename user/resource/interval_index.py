@@ -0,0 +1,109 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import count
+
+
+def naive(dt):
+    return dt.replace(tzinfo=None) if dt.tzinfo else dt
+
+
+class ScheduleIndex:
+    """按执行人与资源分桶的区间索引。
+
+    每个桶保存按开始时间排序的 (start, seq) 列表，并记录桶内最长时长，
+    查询 [start, end) 时只需二分定位候选区间，复杂度 O(log n + k)。
+    支持增量插入与删除，长驻进程可以一直复用同一份索引。
+    """
+
+    def __init__(self, schedules=()):
+        self._buckets = {}
+        self._max_span = {}
+        self._entries = {}
+        self._handles = {}
+        self._seq = count()
+
+        pending = {}
+        for schedule in schedules:
+            seq, keys = self._register(schedule)
+            for key in keys:
+                pending.setdefault(key, []).append((self._entries[seq][0], seq))
+        for key, items in pending.items():
+            items.sort()
+            self._buckets[key] = items
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, schedule):
+        return id(schedule) in self._handles
+
+    @staticmethod
+    def _keys(schedule):
+        return ("executor", schedule.executor), ("resource", schedule.resource)
+
+    def _register(self, schedule):
+        start, end = naive(schedule.startTime), naive(schedule.endTime)
+        keys = self._keys(schedule)
+        seq = next(self._seq)
+        self._entries[seq] = (start, end, keys, schedule)
+        self._handles[id(schedule)] = seq
+        span = end - start
+        for key in keys:
+            if key not in self._max_span or span > self._max_span[key]:
+                self._max_span[key] = span
+        return seq, keys
+
+    def add(self, schedule):
+        if id(schedule) in self._handles:
+            self.discard(schedule)
+        seq, keys = self._register(schedule)
+        start = self._entries[seq][0]
+        for key in keys:
+            insort(self._buckets.setdefault(key, []), (start, seq))
+
+    def discard(self, schedule):
+        seq = self._handles.pop(id(schedule), None)
+        if seq is None:
+            return
+        start, _, keys, _ = self._entries.pop(seq)
+        for key in keys:
+            bucket = self._buckets[key]
+            pos = bisect_left(bucket, (start, seq))
+            if pos < len(bucket) and bucket[pos] == (start, seq):
+                del bucket[pos]
+            if not bucket:
+                del self._buckets[key]
+                del self._max_span[key]
+
+    def move(self, schedule):
+        # 日程时间被修改后调用，刷新其在索引中的位置
+        self.discard(schedule)
+        self.add(schedule)
+
+    def _scan(self, key, start, end, hits):
+        bucket = self._buckets.get(key)
+        if not bucket:
+            return
+        span = self._max_span[key]
+        lo = bisect_right(bucket, (start - span, float("inf")))
+        hi = bisect_left(bucket, (end, -1))
+        for _, seq in bucket[lo:hi]:
+            if self._entries[seq][1] > start:
+                hits.add(seq)
+
+    def overlapping(self, start, end, executor=None, resource=None, by_executor=True, by_resource=True):
+        start, end = naive(start), naive(end)
+        hits = set()
+        if by_executor:
+            self._scan(("executor", executor), start, end, hits)
+        if by_resource:
+            self._scan(("resource", resource), start, end, hits)
+        return [self._entries[seq][3] for seq in sorted(hits)]
+
+    def conflicts_with(self, target_schedule):
+        return [
+            schedule for schedule in self.overlapping(
+                target_schedule.startTime, target_schedule.endTime,
+                executor=target_schedule.executor, resource=target_schedule.resource,
+            )
+            if schedule != target_schedule
+        ]
@@ -1,6 +1,21 @@
-import random
-from datetime import timedelta, datetime
-from copy import deepcopy
+from copy import copy
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from .executor import evaluate_population
+from .fitness import MICROS_PER_SLOT, ScheduleTable
+from .interval_index import ScheduleIndex, naive
+
+# 遗传算法只会在日程原本所在的日期内挪动时间，取前后一天即可覆盖所有可能受影响的日程
+RESCHEDULE_HORIZON = timedelta(days=1)
+
+MICROS_PER_MINUTE = 60 * 1_000_000
+MICROS_PER_HOUR = 60 * MICROS_PER_MINUTE
+MICROS_PER_DAY = 24 * MICROS_PER_HOUR
+
+# 改动的基因超过总数的 1/DELTA_LIMIT 时，增量计算不再划算，直接整体重算
+DELTA_LIMIT = 4
 
 
 def fitness(schedule_list):
@@ -38,95 +53,147 @@ def fitness(schedule_list):
     return -(conflict_penalty * 100 + time_shift_penalty)
 
 
-def initialize_population(existing_schedules, new_schedule, population_size=10):
-    population = []
-
-    new_schedule.original_startTime = new_schedule.startTime
+def build_table(existing_schedules, new_schedule):
+    # 共享的只读基因表：时长、执行人、资源、优先级只编码一次
+    table = ScheduleTable(list(existing_schedules) + [new_schedule])
+    table.original = table.start.copy()
+    table.has_original[:] = True
+    return table
 
-    for _ in range(population_size):
-        individual = []
-        adjusted_new = deepcopy(new_schedule)
 
-        for schedule in existing_schedules:
-            schedule_copy = deepcopy(schedule)
-            if check_conflicts([adjusted_new], schedule_copy):
-                if schedule_copy.priority < adjusted_new.priority:
-                    schedule_copy.original_startTime = schedule_copy.startTime
-                    base_date = schedule_copy.startTime.date()
-                    random_hour = random.randint(8, 19)
-                    random_minute = random.choice([0, 15, 30, 45])
-                    duration = schedule_copy.endTime - schedule_copy.startTime
-                    schedule_copy.startTime = datetime.combine(base_date, datetime.min.time()) + timedelta(
-                        hours=random_hour, minutes=random_minute)
-                    schedule_copy.endTime = schedule_copy.startTime + duration
-                elif schedule_copy.priority >= adjusted_new.priority:
-                    base_date = adjusted_new.startTime.date()
-                    random_hour = random.randint(8, 19)
-                    random_minute = random.choice([0, 15, 30, 45])
-                    duration = adjusted_new.endTime - adjusted_new.startTime
-                    adjusted_new.startTime = datetime.combine(base_date, datetime.min.time()) + timedelta(
-                        hours=random_hour, minutes=random_minute)
-                    adjusted_new.endTime = adjusted_new.startTime + duration
+def random_slots(rng, day_start, size):
+    # 当天 8:00 - 19:45 之间、按 15 分钟对齐的随机时间点
+    return day_start + rng.integers(8 * 4, 20 * 4, size=size) * MICROS_PER_SLOT
 
-            individual.append(schedule_copy)
 
-        individual.append(adjusted_new)
-        population.append(individual)
+def initialize_population(table, rng, population_size=10):
+    n = table.size
+    new = n - 1
+    offsets = np.zeros((population_size, n), dtype=np.int64)
+    movable = np.zeros((population_size, n), dtype=bool)
+    movable[:, new] = True
 
-    return population
+    new_start = np.full(population_size, table.start[new])
+    new_duration = table.duration[new]
+    new_day = table.start[new] - table.start[new] % MICROS_PER_DAY
 
+    related = np.flatnonzero(
+        (table.executor[:new] == table.executor[new]) | (table.resource[:new] == table.resource[new])
+    )
+    for i in related:
+        start, end = table.start[i], table.start[i] + table.duration[i]
+        conflict = (new_start < end) & (new_start + new_duration > start)
+        if not conflict.any():
+            continue
+        if table.priority[i] < table.priority[new]:
+            slots = random_slots(rng, start - start % MICROS_PER_DAY, population_size)
+            offsets[conflict, i] = slots[conflict] - start
+            movable[conflict, i] = True
+        else:
+            slots = random_slots(rng, new_day, population_size)
+            new_start = np.where(conflict, slots, new_start)
 
-def select_parents(population, fitness_scores):
-    min_score = min(fitness_scores)
-    adjusted_scores = [score - min_score + 1 for score in fitness_scores]
-    total = sum(adjusted_scores)
+    offsets[:, new] = new_start - table.start[new]
+    return offsets, movable
 
-    probabilities = [score / total for score in adjusted_scores]
 
-    return random.choices(population, weights=probabilities, k=2)
+def select_parents(fitness_scores, rng):
+    scores = np.asarray(fitness_scores, dtype=float)
+    adjusted_scores = scores - scores.min() + 1
+    probabilities = adjusted_scores / adjusted_scores.sum()
+    return rng.choice(len(scores), size=2, p=probabilities)
 
 
-def crossover(parent1, parent2):
-    crossover_point = random.randint(1, len(parent1) - 1)
-    child1 = parent1[:crossover_point] + parent2[crossover_point:]
-    child2 = parent2[:crossover_point] + parent1[crossover_point:]
+def crossover(parent1, parent2, rng):
+    # 个体为 (offsets, movable) 两行数组，在同一个切点处交换
+    n = len(parent1[0])
+    if n < 2:
+        return parent1, parent2
+    point = rng.integers(1, n)
+    child1 = tuple(np.concatenate((a[:point], b[point:])) for a, b in zip(parent1, parent2))
+    child2 = tuple(np.concatenate((b[:point], a[point:])) for a, b in zip(parent1, parent2))
     return child1, child2
 
 
-def mutate(individual, mutation_rate=0.2):
-    mutated = deepcopy(individual)
-
-    for i in range(len(mutated)):
-        schedule = mutated[i]
-
-        if hasattr(schedule, 'original_startTime') and random.random() < mutation_rate:
-            shift_minutes = random.randint(-60, 60)
-            shift = timedelta(minutes=shift_minutes)
+def mutate(table, offsets, movable, rng, mutation_rate=0.2):
+    selected = movable & (rng.random(offsets.shape) < mutation_rate)
+    shift = rng.integers(-60, 61, size=offsets.shape) * MICROS_PER_MINUTE
 
-            new_start = schedule.startTime + shift
-            new_end = schedule.endTime + shift
+    new_start = table.start + offsets + shift
+    new_end = new_start + table.duration
+    start_hour = new_start % MICROS_PER_DAY // MICROS_PER_HOUR
+    end_hour = new_end % MICROS_PER_DAY // MICROS_PER_HOUR
+    allowed = (start_hour >= 8) & (start_hour < 22) & (end_hour >= 8) & (end_hour < 22)
 
-            if 8 <= new_start.hour < 22 and 8 <= new_end.hour < 22:
-                schedule.startTime = new_start
-                schedule.endTime = new_end
+    return np.where(selected & allowed, offsets + shift, offsets)
 
-    return mutated
 
-
-def genetic_algorithm(existing_schedules, new_schedule, max_generations=50):
-    population = initialize_population(existing_schedules, new_schedule)
-
-    best_individual = None
+def materialize(schedules, offsets, movable):
+    # 只为最终胜出的个体生成模型实例，未移动的日程直接沿用原对象
+    result = []
+    for schedule, offset, moved in zip(schedules, offsets, movable):
+        if not moved:
+            result.append(schedule)
+            continue
+        shift = timedelta(microseconds=int(offset))
+        schedule_copy = copy(schedule)
+        schedule_copy.original_startTime = schedule.startTime
+        schedule_copy.startTime = schedule.startTime + shift
+        schedule_copy.endTime = schedule.endTime + shift
+        result.append(schedule_copy)
+    return result
+
+
+def shift_penalties(table, offsets):
+    return np.abs(offsets).sum(axis=-1) / MICROS_PER_SLOT
+
+
+def score_children(table, offsets, conflicts, parents, children, backend='serial', workers=None):
+    # 子代相对父代只改动了少量基因时，只重算涉及这些基因的日程对
+    child_conflicts = np.empty(len(children), dtype=np.int64)
+    full = []
+    for c, (child, candidates) in enumerate(zip(children, parents)):
+        base = min(candidates, key=lambda p: np.count_nonzero(child != offsets[p]))
+        moved = np.flatnonzero(child != offsets[base])
+        if len(moved) * DELTA_LIMIT > table.size:
+            full.append(c)
+            continue
+        child_conflicts[c] = conflicts[base] + table.conflict_delta(
+            table.start + offsets[base], table.start + child, moved)
+    if full:
+        child_conflicts[full] = evaluate_population(table, table.start + children[full], backend, workers)
+    return child_conflicts
+
+
+def genetic_algorithm(existing_schedules, new_schedule, max_generations=50, population_size=10, seed=None,
+                      backend='serial', workers=None, table=None, initial=None):
+    existing_schedules = list(existing_schedules)
+    # table 可由调用方传入已经建好的基因表（须由 build_table 以同样的参数构建）
+    table = table if table is not None else build_table(existing_schedules, new_schedule)
+    rng = np.random.default_rng(seed)
+
+    # 每个个体只是一行开始时间偏移量（微秒），外加一行“是否允许移动”的标记
+    offsets, movable = initialize_population(table, rng, population_size)
+    if initial is not None:
+        # 用调用方给出的解（如贪心解）替换第一个个体；精英保留保证结果不差于它
+        offsets[0], movable[0] = initial
+    conflicts = np.asarray(evaluate_population(table, table.start + offsets, backend, workers), dtype=np.int64)
+
+    best_offsets = None
+    best_movable = None
+    best_conflict = 0
     best_fitness = float('-inf')
     no_improvement = 0
 
     for generation in range(max_generations):
-        fitness_scores = [fitness(ind) for ind in population]
+        fitness_scores = list(-(conflicts * 100 + shift_penalties(table, offsets)))
 
         current_best = max(fitness_scores)
         if current_best > best_fitness:
             best_fitness = current_best
-            best_individual = population[fitness_scores.index(current_best)]
+            index = fitness_scores.index(current_best)
+            best_offsets, best_movable = offsets[index].copy(), movable[index].copy()
+            best_conflict = conflicts[index]
             no_improvement = 0
         else:
             no_improvement += 1
@@ -134,41 +201,83 @@ def genetic_algorithm(existing_schedules, new_schedule, max_generations=50):
         if best_fitness == 0 or no_improvement >= 5:
             break
 
-        new_population = []
-        for _ in range(len(population) // 2):
-            parent1, parent2 = select_parents(population, fitness_scores)
-            child1, child2 = crossover(parent1, parent2)
-            new_population.append(mutate(child1))
-            new_population.append(mutate(child2))
+        pairs = len(offsets) // 2
+        children_offsets = np.empty((pairs * 2, table.size), dtype=np.int64)
+        children_movable = np.empty((pairs * 2, table.size), dtype=bool)
+        parents = []
+        for k in range(pairs):
+            parent1, parent2 = select_parents(fitness_scores, rng)
+            child1, child2 = crossover((offsets[parent1], movable[parent1]),
+                                       (offsets[parent2], movable[parent2]), rng)
+            children_offsets[2 * k], children_movable[2 * k] = child1
+            children_offsets[2 * k + 1], children_movable[2 * k + 1] = child2
+            parents += [(parent1, parent2)] * 2
+        children_offsets = mutate(table, children_offsets, children_movable, rng)
+        children_conflicts = score_children(table, offsets, conflicts, parents, children_offsets, backend, workers)
 
-        if best_individual not in new_population:
-            new_population[0] = best_individual
+        if not (children_offsets == best_offsets).all(axis=1).any():
+            children_offsets[0], children_movable[0] = best_offsets, best_movable
+            children_conflicts[0] = best_conflict
 
-        population = new_population
+        offsets, movable, conflicts = children_offsets, children_movable, children_conflicts
 
-    return best_individual if best_individual else population[0]
+    if best_offsets is None:
+        best_offsets, best_movable = offsets[0], movable[0]
+    return materialize(existing_schedules + [new_schedule], best_offsets, best_movable)
 
 
-def check_conflicts(existing_schedules, target_schedule):
-    conflicts = []
-    target_start = target_schedule.startTime.replace(tzinfo=None)
-    target_end = target_schedule.endTime.replace(tzinfo=None)
+def day_window(schedule):
+    start = naive(schedule.startTime)
+    day_start = datetime.combine(start.date(), datetime.min.time())
+    return day_start, day_start + timedelta(days=1) + (naive(schedule.endTime) - start)
 
-    for schedule in existing_schedules:
-        if schedule == target_schedule:
-            continue
 
-        s = schedule.startTime.replace(tzinfo=None)
-        e = schedule.endTime.replace(tzinfo=None)
-
-        if (target_start < e and target_end > s and
-                (target_schedule.resource == schedule.resource or
-                 target_schedule.executor == schedule.executor)):
-            conflicts.append({
-                "content": schedule.scheduleContent,
-                "startTime": schedule.startTime,
-                "endTime": schedule.endTime,
-                "resource": schedule.resource,
-                "executor": schedule.executor,
-            })
-    return conflicts
+def displaceable(index, new_schedule):
+    # 新日程可以挪到当天任意时间，沿途可能挤开共享执行人/资源、优先级更低的日程
+    day_start, day_end = day_window(new_schedule)
+    return [
+        schedule for schedule in index.overlapping(
+            day_start, day_end, executor=new_schedule.executor, resource=new_schedule.resource)
+        if schedule.priority < new_schedule.priority
+    ]
+
+
+def affected_component(existing_schedules, new_schedule):
+    """返回 (受影响的连通分量, 其余日程)，只优化前者与优化全部日程的结果相同。
+
+    可移动的是新日程以及被它挤开的低优先级日程，它们都只在各自当天内挪动；
+    与可移动日程共享执行人/资源、且落在其当天时间窗内的日程构成连通分量，
+    其余日程之间的惩罚是常数，不影响优化结果。
+
+    前提：existing_schedules 必须包含每个可移动日程当天时间窗内、共享其执行人或资源的全部日程
+    （storage.reschedule_candidates 按此规则加载），否则分量不完整，优化结果可能与其他日程冲突。
+    """
+    existing_schedules = list(existing_schedules)
+    index = ScheduleIndex(existing_schedules)
+    movable = [new_schedule] + displaceable(index, new_schedule)
+
+    reached = {id(schedule) for schedule in movable}
+    for schedule in movable:
+        day_start, day_end = day_window(schedule)
+        for neighbor in index.overlapping(day_start, day_end, executor=schedule.executor, resource=schedule.resource):
+            reached.add(id(neighbor))
+
+    component = [schedule for schedule in existing_schedules if id(schedule) in reached]
+    rest = [schedule for schedule in existing_schedules if id(schedule) not in reached]
+    return component, rest
+
+
+def check_conflicts(existing_schedules, target_schedule):
+    # existing_schedules 可以是日程列表，也可以是长期复用的 ScheduleIndex
+    if isinstance(existing_schedules, ScheduleIndex):
+        index = existing_schedules
+    else:
+        index = ScheduleIndex(existing_schedules)
+
+    return [{
+        "content": schedule.scheduleContent,
+        "startTime": schedule.startTime,
+        "endTime": schedule.endTime,
+        "resource": schedule.resource,
+        "executor": schedule.executor,
+    } for schedule in index.conflicts_with(target_schedule)]
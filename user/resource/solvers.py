@@ -0,0 +1,171 @@
+import numpy as np
+
+from .fitness import MICROS_PER_SLOT
+from .scheduler import MICROS_PER_DAY, build_table, genetic_algorithm, materialize
+
+# 分支定界的节点上限；最坏情况下的搜索树节点数不超过它时才用分支定界，保证在预算内得到精确解
+BNB_NODE_LIMIT = 5000
+# 日程总数不超过该规模时用遗传算法，否则退化为贪心
+GA_MAX_SCHEDULES = 2000
+
+
+class SlotProblem:
+    """把重排问题描述为：若干可移动日程在当天 15 分钟网格上选位置。
+
+    可移动的只有新日程以及可能被它挤开的低优先级日程，其余日程固定不动；
+    代价即 -fitness。
+    """
+
+    def __init__(self, existing_schedules, new_schedule):
+        self.schedules = list(existing_schedules) + [new_schedule]
+        self.table = table = build_table(existing_schedules, new_schedule)
+        n = table.size
+        new = n - 1
+
+        # 新日程可能落在当天任意时间点，凡是与之共享执行人/资源、位于当天且优先级更低的日程
+        # 都可能被它挤开（与遗传算法初始化时的规则一致）
+        day_start = table.start[new] - table.start[new] % MICROS_PER_DAY
+        end = table.start + table.duration
+        related = ((table.executor == table.executor[new]) | (table.resource == table.resource[new])) & \
+            (table.start < day_start + MICROS_PER_DAY + table.duration[new]) & (end > day_start) & \
+            (table.priority < table.priority[new])
+        related[new] = False
+        self.variables = [new] + list(np.flatnonzero(related))
+
+        self.fixed = np.ones(n, dtype=bool)
+        self.fixed[self.variables] = False
+        self.domains = {v: self._domain(v) for v in self.variables}
+
+    def _domain(self, v):
+        # 原位置（偏移 0）排在最前，其后是当天 8:00 - 19:45 的网格时间点
+        start = self.table.start[v]
+        slots = start - start % MICROS_PER_DAY + np.arange(8 * 4, 20 * 4) * MICROS_PER_SLOT - start
+        return np.concatenate(([0], slots[slots != 0]))
+
+    def fixed_cost(self):
+        start = self.table.start
+        variables = np.asarray(self.variables)
+        conflict = self.table.conflict_penalty(start) - self.table.moved_penalty(start, variables)
+        return conflict * 100.0
+
+    def added_cost(self, v, candidates, offsets, active):
+        # 把 v 放到各候选位置时，与已放置日程新增的惩罚
+        table = self.table
+        indptr, cols, weights = table.neighbors
+        neighbors, neighbor_weights = cols[indptr[v]:indptr[v + 1]], weights[indptr[v]:indptr[v + 1]]
+        keep = active[neighbors]
+        neighbors, neighbor_weights = neighbors[keep], neighbor_weights[keep]
+
+        start = table.start[neighbors] + offsets[neighbors]
+        end = start + table.duration[neighbors]
+        candidate_start = table.start[v] + candidates
+        candidate_end = candidate_start + table.duration[v]
+        overlap = (candidate_start[:, None] < end[None, :]) & (candidate_end[:, None] > start[None, :])
+        return (overlap * neighbor_weights).sum(axis=1) * 100.0 + np.abs(candidates) / MICROS_PER_SLOT
+
+    def search_space(self):
+        # 最坏情况下的搜索树节点数：各层可选位置数的前缀积之和
+        nodes, width = 0, 1
+        for v in self.variables:
+            width *= len(self.domains[v])
+            nodes += width
+        return nodes
+
+    def result(self, offsets):
+        movable = offsets != 0
+        movable[-1] = True
+        return materialize(self.schedules, offsets, movable)
+
+
+def _greedy_offsets(problem):
+    offsets = np.zeros(problem.table.size, dtype=np.int64)
+    active = problem.fixed.copy()
+    cost = problem.fixed_cost()
+    for v in problem.variables:
+        candidates = problem.domains[v]
+        costs = problem.added_cost(v, candidates, offsets, active)
+        conflict_free = np.flatnonzero(costs - np.abs(candidates) / MICROS_PER_SLOT == 0)
+        if len(conflict_free):
+            # 原位置可用就不动，否则取当天最早的空闲时间点
+            choice = 0 if conflict_free[0] == 0 else conflict_free[np.argmin(candidates[conflict_free])]
+        else:
+            choice = int(np.argmin(costs))
+        offsets[v] = candidates[choice]
+        active[v] = True
+        cost += costs[choice]
+    return offsets, cost
+
+
+def greedy_earliest_fit(existing_schedules, new_schedule, problem=None, **options):
+    problem = problem or SlotProblem(existing_schedules, new_schedule)
+    offsets, _ = _greedy_offsets(problem)
+    return problem.result(offsets)
+
+
+def branch_and_bound(existing_schedules, new_schedule, node_limit=BNB_NODE_LIMIT, problem=None, greedy=None,
+                     **options):
+    problem = problem or SlotProblem(existing_schedules, new_schedule)
+    variables = problem.variables
+
+    # 以贪心解作为初始上界
+    best_offsets, best_cost = greedy or _greedy_offsets(problem)
+    offsets = np.zeros(problem.table.size, dtype=np.int64)
+    active = problem.fixed.copy()
+    nodes = 0
+
+    def search(depth, cost):
+        nonlocal best_offsets, best_cost, nodes
+        if depth == len(variables):
+            if cost < best_cost:
+                best_offsets, best_cost = offsets.copy(), cost
+            return
+        v = variables[depth]
+        candidates = problem.domains[v]
+        costs = problem.added_cost(v, candidates, offsets, active)
+        for k in np.argsort(costs, kind='stable'):
+            # 未放置的日程只会增加代价，当前代价即下界
+            if nodes >= node_limit or cost + costs[k] >= best_cost:
+                break
+            nodes += 1
+            offsets[v], active[v] = candidates[k], True
+            search(depth + 1, cost + costs[k])
+            offsets[v], active[v] = 0, False
+
+    search(0, problem.fixed_cost())
+    return problem.result(best_offsets)
+
+
+SOLVERS = {
+    'greedy': greedy_earliest_fit,
+    'branch_and_bound': branch_and_bound,
+    'genetic': genetic_algorithm,
+}
+
+
+def choose_solver(problem):
+    # 按搜索空间而不是可移动日程数选择：每个日程有 48 个候选位置，3 个日程的搜索树就远超节点预算
+    if problem.search_space() <= BNB_NODE_LIMIT:
+        return 'branch_and_bound'
+    if problem.table.size <= GA_MAX_SCHEDULES:
+        return 'genetic'
+    return 'greedy'
+
+
+def solve(existing_schedules, new_schedule, solver='auto', **options):
+    existing_schedules = list(existing_schedules)
+    if solver == 'auto':
+        # 先求贪心解：分支定界以它为初始上界，遗传算法以它作为初始个体，结果都不会比贪心差
+        problem = SlotProblem(existing_schedules, new_schedule)
+        greedy = _greedy_offsets(problem)
+        solver = choose_solver(problem)
+        if solver == 'greedy':
+            return problem.result(greedy[0])
+        if solver == 'genetic':
+            movable = greedy[0] != 0
+            movable[-1] = True
+            options.update(table=problem.table, initial=(greedy[0], movable))
+        else:
+            options.update(problem=problem, greedy=greedy)
+    if solver not in SOLVERS:
+        raise ValueError(f"未知的调度求解器: {solver}")
+    return SOLVERS[solver](existing_schedules, new_schedule, **options)
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+
+from ..services.sync import record_changes
+from .interval_index import ScheduleIndex
+from .scheduler import RESCHEDULE_HORIZON, day_window, displaceable
+
+
+class StaleScheduleError(Exception):
+    def __init__(self, ids):
+        super().__init__(f"日程已被修改: {sorted(ids)}")
+        self.ids = ids
+
+
+def conflict_candidates(model, new_schedule, horizon=timedelta(0)):
+    # 只取执行人或资源相同、且时间窗口（可按调整范围扩展）有交叠的日程
+    window_start = new_schedule.startTime - horizon
+    window_end = new_schedule.endTime + horizon
+    return model.objects.filter(
+        Q(executor=new_schedule.executor) | Q(resource=new_schedule.resource),
+        startTime__lt=window_end,
+        endTime__gt=window_start,
+    )
+
+
+def _shares_any(executors, resources):
+    query = Q(executor__in=executors) | Q(resource__in=[resource for resource in resources if resource is not None])
+    if None in resources:
+        # 与 fitness 一致：资源同为空也算同一资源
+        query |= Q(resource__isnull=True)
+    return query
+
+
+def reschedule_candidates(model, new_schedule, horizon=RESCHEDULE_HORIZON):
+    # 第一次查询取与新日程共享执行人/资源的日程；其中会被挤开的日程在当天内任意挪动，
+    # 可能撞上与“它们”共享执行人/资源的日程，第二次查询按它们当天的时间窗把这些日程补齐
+    # （被挤开的日程不会再挤开别人，两次查询即可覆盖 affected_component 需要的全部日程）
+    candidates = list(conflict_candidates(model, new_schedule, horizon))
+    displaced = displaceable(ScheduleIndex(candidates), new_schedule)
+    if not displaced:
+        return candidates
+
+    windows = {}
+    for schedule in displaced:
+        executors, resources = windows.setdefault(day_window(schedule), (set(), set()))
+        executors.add(schedule.executor)
+        resources.add(schedule.resource)
+    query = Q()
+    for (day_start, day_end), (executors, resources) in windows.items():
+        query |= Q(startTime__lt=day_end, endTime__gt=day_start) & _shares_any(executors, resources)
+
+    loaded = {schedule.pk for schedule in candidates}
+    candidates += [schedule for schedule in model.objects.filter(query) if schedule.pk not in loaded]
+    return candidates
+
+
+def take_snapshot(schedules):
+    return {schedule.pk: (schedule.startTime, schedule.endTime) for schedule in schedules if schedule.pk is not None}
+
+
+def write_back(model, optimized_schedules, snapshot):
+    # 与加载时的快照在内存中比对，只持久化时间有变化的日程，并在同一事务中一次性批量更新
+    changed, created = [], []
+    for schedule in optimized_schedules:
+        if schedule.pk is None or schedule.pk not in snapshot:
+            created.append(schedule)
+        elif (schedule.startTime, schedule.endTime) != snapshot[schedule.pk]:
+            changed.append(schedule)
+
+    with transaction.atomic():
+        if changed:
+            ids = [schedule.pk for schedule in changed]
+            current = {
+                pk: (start, end) for pk, start, end in
+                model.objects.select_for_update().filter(pk__in=ids).values_list('pk', 'startTime', 'endTime')
+            }
+            # 乐观并发检查：加载之后被他人修改或删除的日程不能被覆盖
+            stale = [pk for pk in ids if current.get(pk) != snapshot[pk]]
+            if stale:
+                raise StaleScheduleError(stale)
+            model.objects.bulk_update(changed, ['startTime', 'endTime'])
+            # bulk_update 不触发 post_save，增量同步日志在这里补记
+            record_changes(changed, 'upsert')
+        for schedule in created:
+            schedule.save()
+    return changed, created
@@ -0,0 +1,105 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Hashable, Optional, Tuple
+
+
+class ParseCache:
+    """解析结果缓存：进程内 LRU，可选过期时间，可选 Django 缓存作为多进程共享的二级缓存。
+
+    键为（预处理后的文本, 参考日期）：同一句“明天上午10点开会”在不同日期解析结果不同，
+    跨过零点后参考日期变化，旧条目自然不再命中。
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, backend=None,
+                 prefix: str = 'schedule-parse'):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend
+        self.prefix = prefix
+        self._entries: 'OrderedDict[Hashable, Tuple[Optional[float], Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+
+    @staticmethod
+    def key(text: str, reference_date: date) -> Tuple[str, str]:
+        return text, reference_date.isoformat()
+
+    def _backend_key(self, key: Tuple[str, str]) -> str:
+        digest = hashlib.sha1('\0'.join(key).encode('utf-8')).hexdigest()
+        return f'{self.prefix}:{digest}'
+
+    def get(self, key: Tuple[str, str]) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        if self.backend is not None:
+            value = self.backend.get(self._backend_key(key))
+            if value is not None:
+                self._store(key, value)
+                with self._lock:
+                    self.hits += 1
+                    self.shared_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: Tuple[str, str], value: Dict) -> None:
+        self._store(key, value)
+        if self.backend is not None:
+            self.backend.set(self._backend_key(key), value, timeout=self.ttl)
+
+    def _store(self, key: Tuple[str, str], value: Dict) -> None:
+        if self.maxsize <= 0:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.shared_hits = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared_hits": self.shared_hits,
+                "hit_rate": self.hits / total if total else None,
+                "shared": self.backend is not None,
+            }
+
+
+def cache_from_settings() -> Optional[ParseCache]:
+    from django.conf import settings
+
+    options = getattr(settings, 'SCHEDULE_PARSE_CACHE', None)
+    if not options:
+        return None
+    backend = None
+    if options.get('BACKEND'):
+        from django.core.cache import caches
+        backend = caches[options['BACKEND']]
+    return ParseCache(maxsize=options.get('MAXSIZE', 1024), ttl=options.get('TTL'), backend=backend)
@@ -0,0 +1,106 @@
+import base64
+import heapq
+import json
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from django.db.models import Q
+
+from user import models
+
+# 同一开始时间下个人日程排在团队日程之前
+CLASS_RANK = {'personal': 0, 'team': 1}
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    """游标无法解析。"""
+
+
+def encode_cursor(key: Tuple[datetime, int, int]) -> str:
+    start, rank, pk = key
+    raw = json.dumps([start.isoformat(), rank, pk]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int, int]:
+    try:
+        start, rank, pk = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(start), int(rank), int(pk)
+    except (ValueError, TypeError):
+        raise InvalidCursor("游标无效")
+
+
+def _after(queryset, rank: int, cursor: Optional[Tuple[datetime, int, int]]):
+    # 键集分页：只取排序键 (startTime, 类别, id) 大于游标的记录；同一张表内类别固定，可化简为 startTime/id 比较
+    if cursor is None:
+        return queryset
+    start, cursor_rank, pk = cursor
+    if rank > cursor_rank:
+        return queryset.filter(startTime__gte=start)
+    if rank < cursor_rank:
+        return queryset.filter(startTime__gt=start)
+    return queryset.filter(Q(startTime__gt=start) | Q(startTime=start, id__gt=pk))
+
+
+def _event(schedule, schedule_class: str, group_name: Optional[str]) -> Dict:
+    return {
+        "id": schedule.id,
+        "content": schedule.scheduleContent,
+        "startTime": schedule.startTime,
+        "endTime": schedule.endTime,
+        "resource": schedule.resource,
+        "priority": schedule.priority,
+        "state": schedule.state,
+        "class": schedule_class,
+        "groupName": group_name
+    }
+
+
+def calendar_page(username: str, start: datetime, end: datetime, state: Optional[int] = None,
+                  priority: Optional[int] = None, schedule_class: Optional[str] = None,
+                  cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict:
+    """返回用户在 [start, end) 窗口内的一页日程（个人 + 所在群组中分配给自己的），按开始时间排序。
+
+    每张表只取 limit + 1 条，两路有序结果归并后截断；has_more 为真时用 next_cursor 取下一页。
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    after = decode_cursor(cursor) if cursor else None
+
+    sources = []
+    if schedule_class in (None, 'personal'):
+        sources.append(('personal', models.Schedule.objects.filter(executor=username)))
+    if schedule_class in (None, 'team'):
+        group_ids = models.TeamMember.objects.filter(username=username).values_list('groupID', flat=True)
+        sources.append(('team', models.GroupSchedule.objects.filter(groupID__in=group_ids, executor=username)))
+
+    streams = []
+    team_group_ids = set()
+    for name, queryset in sources:
+        rank = CLASS_RANK[name]
+        queryset = queryset.filter(startTime__lt=end, endTime__gt=start)
+        if state is not None:
+            queryset = queryset.filter(state=state)
+        if priority is not None:
+            queryset = queryset.filter(priority=priority)
+        rows = list(_after(queryset, rank, after).order_by('startTime', 'id')[:limit + 1])
+        if name == 'team':
+            team_group_ids.update(row.groupID for row in rows)
+        streams.append([((row.startTime, rank, row.id), name, row) for row in rows])
+
+    page = list(heapq.merge(*streams, key=lambda item: item[0]))[:limit + 1]
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    group_names = dict(
+        models.TeamGroup.objects.filter(groupID__in=team_group_ids).values_list('groupID', 'groupName'))
+    events = [
+        _event(row, name, group_names.get(row.groupID) if name == 'team' else None)
+        for _, name, row in page
+    ]
+    return {
+        "events": events,
+        "has_more": has_more,
+        "next_cursor": encode_cursor(page[-1][0]) if has_more else None,
+    }
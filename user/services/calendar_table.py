@@ -0,0 +1,130 @@
+import re
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+WEEKDAY_CHARS = '一二三四五六七日天'
+CHINESE_DIGITS = '一二三四五六七八九'
+
+# 一次扫描找出文本中的相对日期短语。各类短语只在两种情况下相互重叠：
+# 较长的高优先级短语包含低优先级短语（如“下周三”中的“周三”），不影响判断；
+# 完整日期包含“月日”（优先级反而更高），在 decisive_phrase 中单独处理
+# 开头的零宽断言先按首字过滤，避免在每个位置逐个尝试全部分支
+DATE_TOKEN_PATTERN = re.compile('(?=[下本周星礼\\d])(?:' + '|'.join([
+    r'(?P<week_after_next_day>下下周[一二三四五六七日天])',
+    r'(?P<week_after_next>下下周|下下个星期)',
+    r'(?P<next_month_day>下(?:个)?月(?:[零〇一二两三四五六七八九十百]+|\d{1,2})[号日])',
+    r'(?P<next_month_weekday>下(?:个)?月(?:第[一二三四]周)?(?:周|星期|礼拜)[一二三四五六七日天])',
+    r'(?P<next_month>下个月|下月)',
+    r'(?P<next_week>下周(?:星期|礼拜|周)?[一二三四五六七日天])',
+    r'(?P<this_week>本(?:个)?(?:星期|礼拜|周)[一二三四五六七日天])',
+    r'(?P<weekday>(?:星期|礼拜|周)[一二三四五六七日天])',
+    r'(?P<this_month_day>本(?:个)?月\d{1,2}[号日])',
+    r'(?P<month_day>\d{1,2}月\d{1,2}[号日])',
+    r'(?P<full_date>\d{4}年\d{1,2}月\d{1,2}[号日]?)',
+]) + ')')
+
+
+def chinese_number(n: int) -> str:
+    # 1 - 99 的汉字写法：十一、二十、三十一
+    tens, ones = divmod(n, 10)
+    prefix = '' if tens == 0 else ('十' if tens == 1 else CHINESE_DIGITS[tens - 1] + '十')
+    return prefix + (CHINESE_DIGITS[ones - 1] if ones else '')
+
+
+def common_phrases() -> Iterator[str]:
+    """预先计算的相对日期短语，覆盖日常输入中的绝大多数写法。"""
+    yield from ('今', '明', '后天', '下下周', '下下个星期', '下个月', '下月')
+    for day in WEEKDAY_CHARS:
+        yield '下下周' + day
+        for prefix in ('下周', '下周星期', '下周礼拜', '下周周'):
+            yield prefix + day
+        for prefix in ('本', '本个'):
+            for unit in ('星期', '礼拜', '周'):
+                yield prefix + unit + day
+        for unit in ('星期', '礼拜', '周'):
+            yield unit + day
+            for month in ('下月', '下个月'):
+                yield month + unit + day
+                for week in '一二三四':
+                    yield f'{month}第{week}周{unit}{day}'
+    for day in range(1, 32):
+        for suffix in ('号', '日'):
+            for month in ('下月', '下个月'):
+                yield f'{month}{day}{suffix}'
+                yield f'{month}{chinese_number(day)}{suffix}'
+            for month in ('本月', '本个月'):
+                yield f'{month}{day}{suffix}'
+            for month in range(1, 13):
+                yield f'{month}月{day}{suffix}'
+
+
+class CalendarTable:
+    """按参考日期预先计算的“短语 -> 日期”表。
+
+    resolve 为原有的逐条判断逻辑（ScheduleParser._resolve_base_date），建表时对每个短语调用一次；
+    查询时只需扫描一次文本、按原有的判断顺序选出起决定作用的短语，再查表。
+    表外的短语（如完整日期）回退到 resolve，并补进当天的表。
+    """
+
+    def __init__(self, resolve: Callable[[str, datetime], datetime], maxsize: int = 8):
+        self._resolve = resolve
+        self.table = lru_cache(maxsize=maxsize)(self._build)
+        # 最近一次查询的 (日期, 表)，作为一个整体替换，多线程下不会错配
+        self._current: Tuple[Optional[date], Dict[str, datetime]] = (None, {})
+
+    def _build(self, day: date) -> Dict[str, datetime]:
+        now = datetime.combine(day, time())
+        entries = {'': now}
+        for phrase in common_phrases():
+            try:
+                entries[phrase] = datetime.combine(self._resolve(phrase, now).date(), time())
+            except (ValueError, KeyError):
+                pass  # 非法日期（如“下个月0号”、“周七”）留给查询时按原逻辑抛出
+        return entries
+
+    @staticmethod
+    def decisive_phrase(text: str) -> str:
+        # 原逻辑最先判断的三类只看是否出现，直接用 in 判断
+        for phrase in ('今', '明', '后天'):
+            if phrase in text:
+                return phrase
+
+        # 各类短语首次出现的位置，再按原逻辑的判断顺序取第一类
+        first: Dict[str, str] = {}
+        for match in DATE_TOKEN_PATTERN.finditer(text):
+            group = match.lastgroup
+            if group not in first:
+                first[group] = match.group(group)
+            if group == 'full_date' and 'month_day' not in first and match.group(group)[-1] in '号日':
+                # “2025年3月12日”中的“3月12日”会先于完整日期被原逻辑命中
+                first['month_day'] = match.group(group)[5:]
+
+        if 'week_after_next_day' in first:
+            return first['week_after_next_day']
+        if 'week_after_next' in first:
+            return '下下周'
+        if 'next_month_day' in first:
+            return first['next_month_day']
+        if 'next_month_weekday' in first:
+            return first['next_month_weekday']
+        if 'next_month' in first:
+            return '下个月'
+        for group in ('next_week', 'this_week', 'weekday', 'this_month_day', 'month_day', 'full_date'):
+            if group in first:
+                return first[group]
+        return ''
+
+    def lookup(self, text: str, now: datetime) -> datetime:
+        # 返回当天零点：调用方只取日期并重新设置时分秒
+        phrase = self.decisive_phrase(text)
+        day = now.date()
+        current_day, entries = self._current
+        if day != current_day:
+            entries = self.table(day)
+            self._current = (day, entries)
+        base_date = entries.get(phrase)
+        if base_date is None:
+            base_date = datetime.combine(self._resolve(phrase, now).date(), time())
+            entries[phrase] = base_date
+        return base_date
@@ -0,0 +1,65 @@
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from user import models
+
+
+class GroupNotFound(Exception):
+    """成员记录指向的群组已不存在。"""
+
+
+def _cache():
+    # GROUP_INFO_CACHE 未配置或 BACKEND 为 None 时不缓存
+    options = getattr(settings, 'GROUP_INFO_CACHE', None)
+    if not options or not options.get('BACKEND'):
+        return None, None
+    return caches[options['BACKEND']], options.get('TTL')
+
+
+def _cache_key(username: str) -> str:
+    return f'group-info:{username}'
+
+
+def load_group_info(username: str) -> List[Dict]:
+    # 一次取出用户所在的全部群组，按成员记录的顺序输出
+    group_ids = list(models.TeamMember.objects.filter(username=username).values_list('groupID', flat=True))
+    groups = {group.groupID: group for group in models.TeamGroup.objects.filter(groupID__in=group_ids)}
+    group_info_list = []
+    for group_id in group_ids:
+        group = groups.get(group_id)
+        if group is None:
+            raise GroupNotFound(group_id)
+        group_info_list.append({
+            "groupID": group.groupID,
+            "groupName": group.groupName,
+            "groupDescription": group.groupDescription,
+            "groupOwner": group.groupOwner
+        })
+    return group_info_list
+
+
+def get_group_info_list(username: str) -> List[Dict]:
+    cache, ttl = _cache()
+    if cache is None:
+        return load_group_info(username)
+    group_info_list: Optional[List[Dict]] = cache.get(_cache_key(username))
+    if group_info_list is None:
+        group_info_list = load_group_info(username)
+        cache.set(_cache_key(username), group_info_list, ttl)
+    return group_info_list
+
+
+def invalidate_user(username: str) -> None:
+    cache, _ = _cache()
+    if cache is not None:
+        cache.delete(_cache_key(username))
+
+
+def invalidate_group(group_id: str) -> None:
+    # 群组信息变化时，该群所有成员的列表都要失效
+    cache, _ = _cache()
+    if cache is not None:
+        usernames = models.TeamMember.objects.filter(groupID=group_id).values_list('username', flat=True)
+        cache.delete_many([_cache_key(username) for username in usernames])
@@ -0,0 +1,74 @@
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, NamedTuple
+
+
+class Hit(NamedTuple):
+    start: int
+    end: int
+    word: str
+    category: Hashable
+
+
+class KeywordHits:
+
+    def __init__(self, hits: List[Hit]):
+        self.hits = hits
+        self._by_category: Dict[Hashable, List[str]] = {}
+        for hit in hits:
+            words = self._by_category.setdefault(hit.category, [])
+            if hit.word not in words:
+                words.append(hit.word)
+
+    def words(self, category: Hashable) -> List[str]:
+        # 按在文本中首次出现的位置排序、去重后的命中词
+        return self._by_category.get(category, [])
+
+
+class KeywordAutomaton:
+    """Aho-Corasick 多模式匹配：一次扫描文本即可找出所有关键词（含相互重叠的）。"""
+
+    def __init__(self, keywords: Dict[Hashable, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[tuple]] = [[]]
+        for category, words in keywords.items():
+            for word in words:
+                self._add(word, category)
+        self._build()
+
+    def _add(self, word: str, category: Hashable) -> None:
+        node = 0
+        for char in word:
+            if char not in self._goto[node]:
+                self._goto[node][char] = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = self._goto[node][char]
+        if (word, category) not in self._output[node]:
+            self._output[node].append((word, category))
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[child] = fail if fail != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def scan(self, text: str) -> KeywordHits:
+        hits = []
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for word, category in self._output[node]:
+                hits.append(Hit(i + 1 - len(word), i + 1, word, category))
+        hits.sort(key=lambda hit: (hit.start, -len(hit.word)))
+        return KeywordHits(hits)
@@ -1,5 +1,8 @@
 import re
+import threading
+import time
 from calendar import monthrange
+from collections import Counter
 
 import jiagu
 from datetime import datetime, timedelta
@@ -8,11 +11,59 @@ import requests
 from dateutil.parser import parse as date_parse
 from dateutil.relativedelta import relativedelta
 
+from .cache import ParseCache, cache_from_settings
+from .calendar_table import CalendarTable
+from .matcher import Hit, KeywordAutomaton, KeywordHits
+from .profiling import ParseTimer, StageProfiler, profiler_from_settings
+
+# 所有正则在模块加载时编译一次
+RANGE_SEPARATOR_PATTERN = re.compile(r'[到至~-]')
+NOISE_PATTERN = re.compile(r'[^\u4e00-\u9fa5\d\s:：\-]')
+TIME_RANGE_PATTERN = re.compile(
+    r'(上午|下午|中午|晚上)?\s*([零〇一二两三四五六七八九十\d]{1,3})点(半|[零〇一二三四五六七八九十\d]{0,3})?[分]?'
+    r'\s*[-到至~]+\s*([零〇一二两三四五六七八九十\d]{1,3})点(半|[零〇一二三四五六七八九十\d]{0,3})?[分]?'
+)
+
+WEEK_AFTER_NEXT_PATTERN = re.compile(r'下下周([一二三四五六七日天])')
+NEXT_MONTH_DAY_PATTERN = re.compile(r'下(?:个)?月([零〇一二两三四五六七八九十百]+|\d{1,2})[号日]')
+NEXT_MONTH_WEEKDAY_PATTERN = re.compile(r'下(?:个)?月(?:第([一二三四])周)?(?:周|星期|礼拜)([一二三四五六七日天])')
+NEXT_WEEK_PATTERN = re.compile(r'下周(?:星期|礼拜|周)?([一二三四五六七日天])')
+THIS_WEEK_PATTERN = re.compile(r'本(?:个)?(?:星期|礼拜|周)([一二三四五六七日天])')
+WEEKDAY_PATTERN = re.compile(r'(?:星期|礼拜|周)([一二三四五六七日天])')
+THIS_MONTH_DAY_PATTERN = re.compile(r'本(?:个)?月(\d{1,2})[号日]')
+MONTH_DAY_PATTERN = re.compile(r'(\d{1,2})月(\d{1,2})[号日]')
+FULL_DATE_PATTERN = re.compile(r'(\d{4})年(\d{1,2})月(\d{1,2})[号日]?')
+
+CHINESE_HALF_HOUR_PATTERN = re.compile(r'([零〇一二三四五六七八九十]+)点半')
+DIGIT_HALF_HOUR_PATTERN = re.compile(r'(\d+)点(30|三十|半)(分)?')
+CHINESE_CLOCK_PATTERN = re.compile(r'([零〇一二三四五六七八九十]+)点([零〇一二三四五六七八九十]+)?分?')
+DIGIT_CLOCK_PATTERN = re.compile(r'(\d{1,2})[:点时](\d{0,2})分?')
+DURATION_PATTERN = re.compile(r'(半|一|两|三|\d+)\s*(小时|分钟|h|min)')
+
+# 提取事件内容时需要剔除的时间表达，按顺序依次替换（顺序会影响结果，如“周三点名”）
+TIME_EXPRESSION_PATTERNS = tuple(re.compile(pattern) for pattern in [
+    r'\d{1,2}[:点时]\d{0,2}分?\s*-\s*\d{1,2}[:点时]\d{0,2}分?',
+    r'[零〇一二三四五六七八九十百\d]{1,3}[点时][:：]?[零〇一二三四五六七八九十百\d]{0,2}分?\s*[-~至到]?\s*'
+    r'[零〇一二三四五六七八九十百\d]{1,3}[点时][:：]?[零〇一二三四五六七八九十百\d]{0,2}分?',
+    r'[零〇一二三四五六七八九十百\d]{1,3}点半',
+    r'[零〇一二三四五六七八九十百\d]{1,3}[点时][:：]?[零〇一二三四五六七八九十百\d]{0,2}分?',
+    r'上午|下午|晚上|中午',
+    r'下周(?:星期|礼拜|周)?[一二三四五六七日天]',
+    r'本(?:个)?(?:星期|礼拜|周)[一二三四五六七日天]',
+    r'(?:星期|礼拜|周)[一二三四五六七日天]',
+    r'今天|明天|后天|大后天|下周|下个月|下月|本月|本(?:个)?月|本周|本(?:个)?星期|本礼拜',
+    r'预计需要\d+\s*(?:小时|分钟|h|min)',
+    r'约?\d+\s*(?:小时|分钟|h|min)(?:左右|钟)?',
+])
+
 
 class ScheduleParser:
+    CONTENT_DELIMITERS = ('，', '。', '！', '？', '；', '-')
 
-    def __init__(self):
+    def __init__(self, cache: Optional[ParseCache] = None, profiler: Optional[StageProfiler] = None):
         jiagu.init()
+        self.cache = cache
+        self.profiler = profiler
 
         self.ACTION_VERBS = [
             '准备', '完成', '提交', '讨论', '进行', '检查', '安排', '参加', '召开',
@@ -67,6 +118,27 @@ class ScheduleParser:
             2: []
         }
 
+        self._action_verbs = frozenset(self.ACTION_VERBS)
+        self._resource_order = {}
+        for words in self.RESOURCE_DB.values():
+            for word in words:
+                self._resource_order.setdefault(word, len(self._resource_order))
+        # 资源、动作动词、优先级关键词合并到同一个自动机，一次扫描得到全部命中
+        keywords = {('resource', category): words for category, words in self.RESOURCE_DB.items()}
+        keywords[('verb',)] = self.ACTION_VERBS
+        keywords.update({('priority', level): words for level, words in self.PRIORITY_KEYWORDS.items()})
+        self._keywords = KeywordAutomaton(keywords)
+
+        # jiagu 分词词典：用于判断关键词命中的动词边界是否会被分词切开或并入更长的词
+        segmenter = getattr(jiagu.any, 'seg_nroute', None)
+        self._segmenter_vocab = getattr(segmenter, 'vocab', None)
+        self._segmenter_max_word = getattr(segmenter, 'max_word_len', 0)
+        self.tier_counts = Counter()
+        self._tier_lock = threading.Lock()
+
+        # 相对日期短语按参考日期预先算好，解析时扫描一次文本后查表
+        self._calendar = CalendarTable(self._resolve_base_date)
+
         self.CHINESE_NUM_MAP = {
             '零': 0, '〇': 0, '一': 1, '两': 2,'二': 2, '三': 3, '四': 4,
             '五': 5, '六': 6, '七': 7, '八': 8, '九': 9, '十': 10,
@@ -75,40 +147,92 @@ class ScheduleParser:
             '二十一': 21, '二十二': 22, '二十三': 23
         }
 
-    def parse(self, text: str, executor: str) -> Dict:
+    def parse(self, text: str, executor: str, now: Optional[datetime] = None) -> Dict:
+        # now 为解析相对日期（“明天”、“下周三”）时的参考时间，默认取本机当前时间
+        return self._parse(text, executor, now or datetime.now())
+
+    def parse_many(self, texts: List[str], executor: str, now: Optional[datetime] = None) -> List[Dict]:
+        # 批量解析：整批共用同一个“当前时间”，相同文本只分词一次；
+        # 单条失败不影响其它条目，结果与输入一一对应
+        now = now or datetime.now()
+        segments: Dict[str, List[str]] = {}
+        results = []
+        for text in texts:
+            try:
+                if not isinstance(text, str):
+                    raise ValueError("输入文本必须是字符串")
+                results.append({"success": True, "data": self._parse(text, executor, now, segments)})
+            except Exception as e:
+                results.append({"success": False, "error": str(e)})
+        return results
+
+    def _parse(self, text: str, executor: str, now: datetime,
+               segments: Optional[Dict[str, List[str]]] = None) -> Dict:
         if not text.strip():
             raise ValueError("输入文本不能为空")
 
-        original_text = text
-        clean_text = self._preprocess_text(text)
+        timer = self.profiler.start() if self.profiler is not None else None
+        try:
+            return self._parse_stages(text, executor, now, segments, timer)
+        finally:
+            if timer is not None:
+                timer.finish()
 
-        time_range = self._parse_time_range(clean_text)
+    def _parse_stages(self, text: str, executor: str, now: datetime,
+                      segments: Optional[Dict[str, List[str]]], timer: Optional[ParseTimer]) -> Dict:
+        # timer 为 None 表示本次解析未被抽样，各阶段不计时
+        clean_text = self._preprocess_text(text)
+        if timer: timer.lap('preprocess')
+
+        # 解析结果只取决于预处理后的文本和参考日期，执行人在取出后再填入
+        if self.cache is not None:
+            key = ParseCache.key(clean_text, now.date())
+            cached = self.cache.get(key)
+            if timer: timer.lap('cache')
+            if cached is not None:
+                self._count_tier('cache')
+                return {"executor": executor, **cached, "extractionTier": "cache"}
+
+        time_range = self._parse_time_range(clean_text, now)
+        if timer: timer.lap('time_range')
         if time_range:
             start_time, end_time = time_range
         else:
-            start_time, end_time = self._parse_relative_time(clean_text)
+            start_time, end_time = self._parse_relative_time(clean_text, now)
+            if timer: timer.lap('relative_time')
 
-        content = self._extract_action_content(clean_text)
+        hits = self._keywords.scan(clean_text)
+        if timer: timer.lap('keywords')
+        content, tier = self._extract_action(clean_text, hits, segments)
+        self._count_tier(tier)
+        if timer: timer.lap('content')
 
-        resources = self._find_resources(clean_text)
-        priority = self._detect_priority(clean_text)
+        resources = self._find_resources(clean_text, hits)
+        if timer: timer.lap('resources')
+        priority = self._detect_priority(clean_text, hits)
+        if timer: timer.lap('priority')
 
-        return {
-            "executor": executor,
+        result = {
             "scheduleContent": content[:256],
             "startTime": start_time,
             "endTime": end_time,
             "resource": ",".join(resources),
             "priority": priority
         }
+        if self.cache is not None:
+            self.cache.set(key, result)
+        return {"executor": executor, **result, "extractionTier": tier}
+
+    def _count_tier(self, tier: str) -> None:
+        with self._tier_lock:
+            self.tier_counts[tier] += 1
 
     def _preprocess_text(self, text: str) -> str:
-        text = re.sub(r'[到至~-]', '-', text)
-        return re.sub(r'[^\u4e00-\u9fa5\d\s:：\-]', '', text).strip()
+        text = RANGE_SEPARATOR_PATTERN.sub('-', text)
+        return NOISE_PATTERN.sub('', text).strip()
 
-    def _parse_time_range(self, text: str) -> Optional[Tuple[str, str]]:
-        pattern = r'(上午|下午|中午|晚上)?\s*([零〇一二两三四五六七八九十\d]{1,3})点(半|[零〇一二三四五六七八九十\d]{0,3})?[分]?\s*[-到至~]+\s*([零〇一二两三四五六七八九十\d]{1,3})点(半|[零〇一二三四五六七八九十\d]{0,3})?[分]?'
-        match = re.search(pattern, text)
+    def _parse_time_range(self, text: str, now: Optional[datetime] = None) -> Optional[Tuple[str, str]]:
+        match = TIME_RANGE_PATTERN.search(text)
         if match:
             period, sh_str, sm_str, eh_str, em_str = match.groups()
 
@@ -133,7 +257,7 @@ class ScheduleParser:
                 if end_h < 11:
                     end_h += 12
 
-            base_date = self._get_base_date(text)
+            base_date = self._get_base_date(text, now)
 
             start_time = base_date.replace(hour=start_h, minute=start_m, second=0)
             end_time = base_date.replace(hour=end_h, minute=end_m, second=0)
@@ -147,8 +271,20 @@ class ScheduleParser:
             )
         return None
 
-    def _get_base_date(self, text: str) -> datetime:
-        now = datetime.now()
+    def _get_base_date(self, text: str, now: Optional[datetime] = None) -> datetime:
+        # 嵌套在 time_range / relative_time 阶段内，单独记一个 base_date 阶段
+        now = now or datetime.now()
+        timer = self.profiler.current() if self.profiler is not None else None
+        if timer is None:
+            return self._calendar.lookup(text, now)
+        started = time.perf_counter()
+        base_date = self._calendar.lookup(text, now)
+        timer.add('base_date', time.perf_counter() - started)
+        return base_date
+
+    def _resolve_base_date(self, text: str, now: Optional[datetime] = None) -> datetime:
+        # 逐条判断的原始实现，用于生成日期表以及处理表外的短语
+        now = now or datetime.now()
 
         if '今天' in text or '今日' in text or '今' in text: return now
         if '明天' in text or '明日' in text or '明' in text: return now + timedelta(days=1)
@@ -157,7 +293,7 @@ class ScheduleParser:
 
         if '下下周' in text or '下下个星期' in text:
             base_date = now + timedelta(days=7)
-            if match := re.search(r'下下周([一二三四五六七日天])', text):
+            if match := WEEK_AFTER_NEXT_PATTERN.search(text):
                 weekday_map = {'一': 0, '二': 1, '三': 2, '四': 3, '五': 4, '六': 5, '日': 6, '天': 6}
                 target_weekday = weekday_map[match.group(1)]
                 current_weekday = base_date.weekday()
@@ -168,7 +304,7 @@ class ScheduleParser:
         if '下个月' in text or '下月' in text:
             next_month = now + relativedelta(months=1)
 
-            if match := re.search(r'下(?:个)?月([零〇一二两三四五六七八九十百]+|\d{1,2})[号日]', text):
+            if match := NEXT_MONTH_DAY_PATTERN.search(text):
                 day_str = match.group(1)
                 if day_str.isdigit():
                     day = int(day_str)
@@ -181,8 +317,7 @@ class ScheduleParser:
                 day = min(day, max_day)
                 return datetime(year, month, day)
 
-            if match := re.search(r'下(?:个)?月(?:第([一二三四])周)?(?:周|星期|礼拜)([一二三四五六七日天])',
-                                  text):
+            if match := NEXT_MONTH_WEEKDAY_PATTERN.search(text):
                 week_num = match.group(1)
                 weekday_char = match.group(2)
 
@@ -204,29 +339,29 @@ class ScheduleParser:
             return next_month.replace(day=1)
 
         weekday_map = {'一': 0, '二': 1, '三': 2, '四': 3, '五': 4, '六': 5, '日': 6, '天': 6}
-        if match := re.search(r'下周(?:星期|礼拜|周)?([一二三四五六七日天])', text):
+        if match := NEXT_WEEK_PATTERN.search(text):
             target_day = weekday_map[match.group(1)]
             delta = target_day - now.weekday() + 7
             return now + timedelta(days=delta)
 
-        if match := re.search(r'本(?:个)?(?:星期|礼拜|周)([一二三四五六七日天])', text):
+        if match := THIS_WEEK_PATTERN.search(text):
             target_day = weekday_map[match.group(1)]
             delta = target_day - now.weekday()
             return now + timedelta(days=delta)
 
-        if match := re.search(r'(?:星期|礼拜|周)([一二三四五六七日天])', text):
+        if match := WEEKDAY_PATTERN.search(text):
             target_day = weekday_map[match.group(1)]
             delta = target_day - now.weekday()
             return now + timedelta(days=delta)
 
-        if match := re.search(r'本(?:个)?月(\d{1,2})[号日]', text):
+        if match := THIS_MONTH_DAY_PATTERN.search(text):
             day = int(match.group(1))
             try:
                 return now.replace(day=day)
             except ValueError:
                 return now.replace(day=1) + timedelta(days=day - 1)
 
-        if match := re.search(r'(\d{1,2})月(\d{1,2})[号日]', text):
+        if match := MONTH_DAY_PATTERN.search(text):
             month, day = map(int, match.groups())
             year = now.year + (1 if month < now.month else 0)
             try:
@@ -234,7 +369,7 @@ class ScheduleParser:
             except ValueError:
                 return datetime(year, month, 1) + timedelta(days=day - 1)
 
-        if match := re.search(r'(\d{4})年(\d{1,2})月(\d{1,2})[号日]?', text):
+        if match := FULL_DATE_PATTERN.search(text):
             year, month, day = map(int, match.groups())
             try:
                 return datetime(year, month, day)
@@ -243,8 +378,8 @@ class ScheduleParser:
 
         return now
 
-    def _parse_relative_time(self, text: str) -> Tuple[str, str]:
-        base_date = self._get_base_date(text)
+    def _parse_relative_time(self, text: str, now: Optional[datetime] = None) -> Tuple[str, str]:
+        base_date = self._get_base_date(text, now)
 
         hour, minute = self._parse_exact_time(text)
 
@@ -285,7 +420,7 @@ class ScheduleParser:
     def _parse_exact_time(self, text: str) -> Tuple[int, int]:
         hour, minute = 14, 0  # 默认下午2点
 
-        if match := re.search(r'([零〇一二三四五六七八九十]+)点半', text):
+        if match := CHINESE_HALF_HOUR_PATTERN.search(text):
             hour_str = match.group(1)
             hour = self._chinese_to_arabic(hour_str)
             minute = 30
@@ -298,7 +433,7 @@ class ScheduleParser:
                 hour -= 12
             return hour, minute
 
-        if match := re.search(r'(\d+)点(30|三十|半)(分)?', text):
+        if match := DIGIT_HALF_HOUR_PATTERN.search(text):
             hour = int(match.group(1))
             minute = 30
             if '下午' in text or '晚上' in text:
@@ -309,7 +444,7 @@ class ScheduleParser:
                 hour -= 12
             return hour, minute
 
-        if match := re.search(r'([零〇一二三四五六七八九十]+)点([零〇一二三四五六七八九十]+)?分?', text):
+        if match := CHINESE_CLOCK_PATTERN.search(text):
             hour_str = match.group(1)
             minute_str = match.group(2) or ''
 
@@ -327,7 +462,7 @@ class ScheduleParser:
 
             return hour, minute
 
-        if match := re.search(r'(\d{1,2})[:点时](\d{0,2})分?', text):
+        if match := DIGIT_CLOCK_PATTERN.search(text):
             hour = int(match.group(1))
             minute = int(match.group(2)) if match.group(2) else 0
 
@@ -350,70 +485,150 @@ class ScheduleParser:
 
         return hour, minute
 
-    def _extract_action_content(self, text: str) -> str:
+    def _extract_action_content(self, text: str, hits: Optional[KeywordHits] = None,
+                                segments: Optional[Dict[str, List[str]]] = None) -> str:
+        return self._extract_action(text, hits, segments)[0]
 
+    def _extract_action(self, text: str, hits: Optional[KeywordHits] = None,
+                        segments: Optional[Dict[str, List[str]]] = None) -> Tuple[str, str]:
+        # 分级提取：keyword 为关键词自动机直接定位动作，segmenter 为 jiagu 分词，
+        # none 为文本中没有动作动词、直接去掉时间与资源词
         original_text = text
-        time_patterns = [
-            r'\d{1,2}[:点时]\d{0,2}分?\s*-\s*\d{1,2}[:点时]\d{0,2}分?',
-            r'[零〇一二三四五六七八九十百\d]{1,3}[点时][:：]?[零〇一二三四五六七八九十百\d]{0,2}分?\s*[-~至到]?\s*[零〇一二三四五六七八九十百\d]{1,3}[点时][:：]?[零〇一二三四五六七八九十百\d]{0,2}分?',
-            r'[零〇一二三四五六七八九十百\d]{1,3}点半',
-            r'[零〇一二三四五六七八九十百\d]{1,3}[点时][:：]?[零〇一二三四五六七八九十百\d]{0,2}分?',
-            r'[零〇一二三四五六七八九十百\d]{1,3}点半',
-            r'上午|下午|晚上|中午',
-            r'下周(?:星期|礼拜|周)?[一二三四五六七日天]',
-            r'本(?:个)?(?:星期|礼拜|周)[一二三四五六七日天]',
-            r'(?:星期|礼拜|周)[一二三四五六七日天]',
-            r'今天|明天|后天|大后天|下周|下个月|下月|本月|本(?:个)?月|本周|本(?:个)?星期|本礼拜',
-            r'预计需要\d+\s*(小时|分钟|h|min)',
-            r'约?\d+\s*(小时|分钟|h|min)(?:左右|钟)?'
-        ]
-
-        for pattern in time_patterns:
-            text = re.sub(pattern, '', text)
-
-        words = jiagu.seg(original_text)
-        pos_tags = jiagu.pos(words)
-
-        for i, (word, pos) in enumerate(zip(words, pos_tags)):
-            if (pos == 'v' and word in self.ACTION_VERBS) or word in self.ACTION_VERBS:
+        for pattern in TIME_EXPRESSION_PATTERNS:
+            text = pattern.sub('', text)
+
+        if hits is None:
+            hits = self._keywords.scan(original_text)
+        verbs = [hit for hit in hits.hits if hit.category == ('verb',)]
+
+        # 文本中不含任何动作动词时，分词结果里也不可能有，跳过分词
+        if not verbs:
+            return self._filter_resources(text, hits).strip(), 'none'
+
+        if not self._is_ambiguous(original_text, verbs[0]):
+            content = original_text[verbs[0].start:]
+            for i, char in enumerate(content):
+                if char in self.CONTENT_DELIMITERS:
+                    content = content[:i]
+                    break
+            return content, 'keyword'
+
+        # 只要词在动作动词表中即命中，与词性无关，因此不再做词性标注
+        words = self._segment(original_text, segments)
+
+        for i, word in enumerate(words):
+            if word in self._action_verbs:
                 content = []
                 for w in words[i:]:
-                    if w in ['，', '。', '！', '？', '；', '-']:
+                    if w in self.CONTENT_DELIMITERS:
                         break
                     content.append(w)
-                return ''.join(content)
-        return self._filter_resources(text).strip()
-
-    def _filter_resources(self, text: str) -> str:
-        for words in self.RESOURCE_DB.values():
-            for word in words:
-                text = text.replace(word, '')
+                return ''.join(content), 'segmenter'
+        return self._filter_resources(text, hits).strip(), 'segmenter'
+
+    def _is_ambiguous(self, text: str, hit: Hit) -> bool:
+        # 动词本身不在分词词典中（可能被切成单字），或者词典中有跨越其边界的词
+        # （如“讨论会”、“点评”），分词结果无法确定，需要交给 jiagu
+        vocab = self._segmenter_vocab
+        if not vocab or hit.word not in vocab or any(char.isspace() for char in text):
+            return True
+        longest = self._segmenter_max_word
+        for i in range(max(0, hit.start - longest + 1), hit.end):
+            for j in range(max(i + 2, hit.start + 1), min(len(text), i + longest) + 1):
+                if (i, j) != (hit.start, hit.end) and text[i:j] in vocab:
+                    return True
+        return False
+
+    def _segment(self, text: str, segments: Optional[Dict[str, List[str]]] = None) -> List[str]:
+        if segments is None:
+            return jiagu.seg(text)
+        if text not in segments:
+            segments[text] = jiagu.seg(text)
+        return segments[text]
+
+    def _resource_words(self, text: str, hits: Optional[KeywordHits]) -> List[str]:
+        # 文本中出现的资源词，按首次出现位置排序、去重
+        if hits is None:
+            hits = self._keywords.scan(text)
+        found = []
+        for hit in hits.hits:
+            if hit.category[0] == 'resource' and hit.word not in found:
+                found.append(hit.word)
+        return found
+
+    def _filter_resources(self, text: str, hits: Optional[KeywordHits] = None) -> str:
+        # 只替换实际命中的词，替换顺序仍按词表顺序（长词覆盖短词的效果不变）
+        for word in sorted(self._resource_words(text, hits), key=self._resource_order.get):
+            text = text.replace(word, '')
         return text.strip()
 
-    def _find_resources(self, text: str) -> List[str]:
-        found = set()
-        for category, words in self.RESOURCE_DB.items():
-            for word in words:
-                if word in text and word not in found:
-                    found.add(word)
-        return list(found)
+    def _find_resources(self, text: str, hits: Optional[KeywordHits] = None) -> List[str]:
+        return self._resource_words(text, hits)
 
     def _parse_duration(self, text: str) -> Optional[float]:
-        if match := re.search(r'(半|一|两|三|\d+)\s*(小时|分钟|h|min)', text):
+        if match := DURATION_PATTERN.search(text):
             num_map = {'半': 0.5, '一': 1, '二': 2, '两': 2, '三': 3}
             num = num_map.get(match.group(1), float(match.group(1)))
             unit = match.group(2)
             return num if unit in ['小时', 'h'] else num / 60
         return None
 
-    def _detect_priority(self, text: str) -> int:
-        text_lower = text.lower()
-        for level, keywords in self.PRIORITY_KEYWORDS.items():
-            if any(kw in text_lower for kw in keywords):
+    def _detect_priority(self, text: str, hits: Optional[KeywordHits] = None) -> int:
+        if hits is None:
+            hits = self._keywords.scan(text.lower())
+        for level in self.PRIORITY_KEYWORDS:
+            if hits.words(('priority', level)):
                 return level
         return 2
 
 
+_parser: Optional[ScheduleParser] = None
+_parser_lock = threading.Lock()
+_parser_state = {"status": "cold", "error": None, "load_seconds": None}
+
+
+def get_parser() -> ScheduleParser:
+    # 进程内共享的解析器：jiagu 模型与关键词表只加载一次
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser_state.update(status="loading", error=None)
+                started = time.perf_counter()
+                try:
+                    parser = ScheduleParser(cache=cache_from_settings(), profiler=profiler_from_settings())
+                except Exception as e:
+                    _parser_state.update(status="failed", error=str(e))
+                    raise
+                _parser_state.update(status="ready", load_seconds=time.perf_counter() - started)
+                _parser = parser
+    return _parser
+
+
+def warm_up_parser(background: bool = True) -> None:
+    def load():
+        try:
+            get_parser()
+        except Exception:
+            pass  # 失败信息记录在 parser_status() 中，请求到来时会再次尝试加载
+
+    if background:
+        threading.Thread(target=load, name="schedule-parser-warmup", daemon=True).start()
+    else:
+        load()
+
+
+def parser_status() -> Dict:
+    status = {"ready": _parser is not None, **_parser_state}
+    if _parser is not None:
+        status["tiers"] = dict(_parser.tier_counts)
+    if _parser is not None and _parser.cache is not None:
+        status["cache"] = _parser.cache.stats()
+    if _parser is not None and _parser.profiler is not None:
+        status["profile"] = _parser.profiler.snapshot()
+    return status
+
+
 # 测试用例
 if __name__ == "__main__":
     parser = ScheduleParser()
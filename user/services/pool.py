@@ -0,0 +1,234 @@
+import atexit
+import multiprocessing
+import multiprocessing.util
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+
+from .parser import get_parser, warm_up_parser
+
+
+class ParserPoolBusy(Exception):
+    """解析进程池排队已满或等待超时，调用方应尽快返回 503。"""
+
+
+# worker 进程内为 True：worker 自己在进程内解析，不能再创建进程池
+_in_worker = False
+
+
+def in_worker_process() -> bool:
+    # 解析池 worker 必须据此跳过建池和预热，否则每个 worker 又会拉起自己的进程池，无限递归。
+    # 不能用 multiprocessing.parent_process() 判断：用 multiprocessing 启动的 Web worker（如 uvicorn --workers）也有父进程
+    return _in_worker
+
+
+def pool_enabled() -> bool:
+    from django.conf import settings
+
+    options = getattr(settings, 'SMART_INPUT_POOL', None)
+    return bool(options and options.get('WORKERS')) and not in_worker_process()
+
+
+def _init_worker():
+    # 每个 worker 进程启动时加载一份自己的解析器，之后的请求直接复用
+    global _in_worker
+    _in_worker = True
+    from django.apps import apps
+    if not apps.ready:
+        import django
+        django.setup()
+    get_parser()
+
+
+def _call_parser(method, args, kwargs):
+    return getattr(get_parser(), method)(*args, **kwargs)
+
+
+class ParserPool:
+    """预热的解析进程池：jiagu 推理不占用 Web 请求线程。
+
+    max_pending 限制同时在池中排队/执行的请求数，超过时立即拒绝；
+    timeout 为单个请求等待结果的最长秒数。
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = self._new_executor()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._restart_lock = threading.Lock()
+        self.ready = False
+        self.rejected = 0
+        self.timed_out = 0
+        self.restarts = 0
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # 用 spawn 启动 worker：不继承 Web 进程中的线程和锁（预热线程可能正持有解析器的加载锁）
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_worker)
+
+    def _restart(self, broken: ProcessPoolExecutor, warm_up: bool = True) -> None:
+        # worker 异常退出后 ProcessPoolExecutor 永久不可用，换一个新的；并发请求只重建一次
+        with self._restart_lock:
+            if self._executor is not broken:
+                return
+            self._executor = self._new_executor()
+            broken.shutdown(wait=False, cancel_futures=True)
+            with self._lock:
+                self.ready = False
+                self.restarts += 1
+        if warm_up:
+            warm_up_in_background(self)
+
+    def warm_up(self) -> None:
+        # 同时提交 workers 个空任务，让进程池把所有 worker 都启动起来
+        executor = self._executor
+        try:
+            futures = [executor.submit(_call_parser, 'parse_many', ([], None), {}) for _ in range(self.workers)]
+            for future in futures:
+                future.result()
+        except BrokenProcessPool:
+            # 预热失败时只重建、不再自动预热，避免 worker 启动即崩溃时无限重启
+            self._restart(executor, warm_up=False)
+            raise
+        with self._lock:
+            self.ready = executor is self._executor
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def call(self, method: str, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise ParserPoolBusy("解析服务繁忙，请稍后重试")
+        with self._lock:
+            self._pending += 1
+        executor = self._executor
+        try:
+            future = executor.submit(_call_parser, method, args, kwargs)
+        except BrokenProcessPool:
+            self._release(None)
+            self._restart(executor)
+            raise ParserPoolBusy("解析进程异常退出，正在重启，请稍后重试")
+        except Exception:
+            self._release(None)
+            raise
+        # 名额在任务真正结束时才归还：超时返回的请求仍占着 worker，不能继续往池里塞
+        future.add_done_callback(self._release)
+        try:
+            result = future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            raise ParserPoolBusy("解析超时，请稍后重试")
+        except BrokenProcessPool:
+            # 不重试：可能正是这条输入让 worker 崩溃
+            self._restart(executor)
+            raise ParserPoolBusy("解析进程异常退出，正在重启，请稍后重试")
+        if not self.ready:
+            with self._lock:
+                self.ready = executor is self._executor
+        return result
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "timeout": self.timeout,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "restarts": self.restarts,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_pool: Optional[ParserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> Optional[ParserPool]:
+    # 未配置 SMART_INPUT_POOL、WORKERS 为 0 或本身就在子进程中时返回 None，解析在当前进程内进行
+    global _pool
+    if _pool is None:
+        from django.conf import settings
+
+        if not pool_enabled():
+            return None
+        options = settings.SMART_INPUT_POOL
+        with _pool_lock:
+            if _pool is None:
+                _pool = ParserPool(options['WORKERS'], options.get('MAX_PENDING', options['WORKERS'] * 4),
+                                   options.get('TIMEOUT', 10))
+    return _pool
+
+
+@atexit.register
+def shutdown_pool(wait: bool = False):
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait)
+            _pool = None
+
+
+# 由 multiprocessing 启动的 Web worker（如 uvicorn --workers）退出时不执行 atexit，而是等待自己的子进程结束。
+# 须在 multiprocessing 关闭队列（exitpriority=10）之前同步关掉进程池，否则 worker 收不到退出信号，进程永远退不出
+multiprocessing.util.Finalize(None, shutdown_pool, kwargs={'wait': True}, exitpriority=100)
+
+
+def run_parser(method: str, *args, **kwargs):
+    pool = get_pool()
+    if pool is None:
+        return getattr(get_parser(), method)(*args, **kwargs)
+    return pool.call(method, *args, **kwargs)
+
+
+def pool_status() -> Optional[Dict]:
+    pool = get_pool()
+    return pool.status() if pool is not None else None
+
+
+def warm_up_in_background(pool: ParserPool) -> None:
+    def load():
+        try:
+            pool.warm_up()
+        except Exception:
+            pass  # 进程池已在 warm_up 中重建，ready 保持 False，直到下一个请求成功
+
+    threading.Thread(target=load, name="schedule-parser-pool-warmup", daemon=True).start()
+
+
+def warm_up_pool(background: bool = True) -> None:
+    pool = get_pool()
+    if pool is None:
+        return
+    if background:
+        warm_up_in_background(pool)
+    else:
+        pool.warm_up()
+
+
+def warm_up_services() -> None:
+    # 由 wsgi.py / asgi.py 在服务进程中调用；manage.py 的 migrate、test 等命令不加载 jiagu 模型
+    from django.conf import settings
+
+    if in_worker_process():
+        return
+    if pool_enabled():
+        # 启用进程池时 Web 进程本身不解析，只预热池中的 worker
+        warm_up_pool()
+    elif getattr(settings, 'SCHEDULE_PARSER_WARMUP', False):
+        warm_up_parser()
@@ -0,0 +1,112 @@
+import bisect
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 直方图桶上界（毫秒），最后一个桶收纳所有更慢的样本
+DEFAULT_BUCKETS_MS = (0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class ParseTimer:
+    """一次解析的计时器：各阶段耗时先记在本地，解析结束时一次性交给 StageProfiler。"""
+
+    __slots__ = ('profiler', 'durations', '_started', '_last')
+
+    def __init__(self, profiler: 'StageProfiler'):
+        self.profiler = profiler
+        self.durations: List[Tuple[str, float]] = []
+        self._started = self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        # 记录自上一个阶段结束以来的耗时
+        now = time.perf_counter()
+        self.durations.append((stage, now - self._last))
+        self._last = now
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.durations.append((stage, seconds))
+
+    def finish(self) -> None:
+        self.durations.append(('total', time.perf_counter() - self._started))
+        self.profiler.record(self.durations)
+
+
+class StageProfiler:
+    """按阶段聚合解析耗时的直方图。
+
+    sample_rate 为被计时的解析占比，生产环境可以设成 0.01 之类的小值常开；
+    未被抽中的解析只多一次随机数比较。
+    """
+
+    def __init__(self, sample_rate: float = 1.0, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.sample_rate = sample_rate
+        self.buckets_ms = tuple(buckets_ms)
+        self._bounds = [bound / 1000 for bound in self.buckets_ms]
+        self._stages: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def start(self) -> Optional[ParseTimer]:
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return None
+        timer = ParseTimer(self)
+        self._local.timer = timer
+        return timer
+
+    def current(self) -> Optional[ParseTimer]:
+        # 当前线程中正在计时的解析，供嵌套调用的阶段（如 _get_base_date）使用
+        return getattr(self._local, 'timer', None)
+
+    def record(self, durations: List[Tuple[str, float]]) -> None:
+        self._local.timer = None
+        with self._lock:
+            for stage, seconds in durations:
+                stats = self._stages.get(stage)
+                if stats is None:
+                    stats = self._stages[stage] = {
+                        "count": 0, "sum": 0.0, "max": 0.0, "buckets": [0] * (len(self._bounds) + 1)}
+                stats["count"] += 1
+                stats["sum"] += seconds
+                stats["max"] = max(stats["max"], seconds)
+                stats["buckets"][bisect.bisect_left(self._bounds, seconds)] += 1
+
+    def _quantile(self, buckets: List[int], count: int, q: float) -> Optional[float]:
+        # 以所在桶的上界估计分位数
+        rank = q * count
+        seen = 0
+        for bound, n in zip(self.buckets_ms, buckets):
+            seen += n
+            if seen >= rank:
+                return bound
+        return None  # 落在最后一个（无上界的）桶
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            stages = {}
+            for stage, stats in self._stages.items():
+                count = stats["count"]
+                histogram = {f"le_{bound:g}ms": n for bound, n in zip(self.buckets_ms, stats["buckets"])}
+                histogram["le_inf"] = stats["buckets"][-1]
+                stages[stage] = {
+                    "count": count,
+                    "mean_ms": stats["sum"] / count * 1000,
+                    "max_ms": stats["max"] * 1000,
+                    "p50_ms": self._quantile(stats["buckets"], count, 0.5),
+                    "p99_ms": self._quantile(stats["buckets"], count, 0.99),
+                    "histogram": histogram,
+                }
+            return {"sample_rate": self.sample_rate, "stages": stages}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+
+def profiler_from_settings() -> Optional[StageProfiler]:
+    from django.conf import settings
+
+    options = getattr(settings, 'SCHEDULE_PARSER_PROFILING', None)
+    if not options or not options.get('SAMPLE_RATE'):
+        return None
+    return StageProfiler(sample_rate=options['SAMPLE_RATE'])
@@ -0,0 +1,88 @@
+from typing import Dict, Iterable, List, Optional
+
+from django.db.models import Max, Q
+
+from user import models
+
+# 参与增量同步的模型及其归属字段：个人数据按用户名，团队数据按群组
+SYNC_SCOPES = {
+    models.Schedule: ('executor', None),
+    models.GroupSchedule: (None, 'groupID'),
+    models.Memo: ('username', None),
+    models.TeamMemo: (None, 'groupID'),
+    models.Announcement: (None, 'groupID'),
+}
+SYNC_MODELS = {model._meta.model_name: model for model in SYNC_SCOPES}
+DEFAULT_SYNC_LIMIT = 500
+MAX_SYNC_LIMIT = 2000
+
+
+def _log_entry(instance, action: str) -> models.ChangeLog:
+    user_field, group_field = SYNC_SCOPES[type(instance)]
+    return models.ChangeLog(
+        model=instance._meta.model_name,
+        objectID=instance.pk,
+        action=action,
+        username=getattr(instance, user_field) if user_field else None,
+        groupID=getattr(instance, group_field) if group_field else None,
+    )
+
+
+def record_change(instance, action: str) -> None:
+    _log_entry(instance, action).save()
+
+
+def record_changes(instances: Iterable, action: str) -> None:
+    # bulk_update 等批量操作不触发信号，由调用方显式记录
+    entries = [_log_entry(instance, action) for instance in instances]
+    if entries:
+        models.ChangeLog.objects.bulk_create(entries)
+
+
+def current_token() -> int:
+    return models.ChangeLog.objects.aggregate(token=Max('id'))['token'] or 0
+
+
+def changes_since(username: str, token: int, limit: int = DEFAULT_SYNC_LIMIT) -> Dict:
+    """返回令牌之后与用户相关的变更：同一对象只保留最新状态，已删除的对象只返回墓碑。
+
+    每次最多读取 limit 条日志；has_more 为真时用返回的 token 继续拉取。
+    """
+    limit = max(1, min(limit, MAX_SYNC_LIMIT))
+    group_ids = models.TeamMember.objects.filter(username=username).values_list('groupID', flat=True)
+    entries = list(
+        models.ChangeLog.objects
+        .filter(Q(username=username) | Q(groupID__in=group_ids), id__gt=token)
+        .order_by('id')
+        .values_list('id', 'model', 'objectID', 'action')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    latest: Dict[tuple, str] = {}
+    for _, model_name, object_id, action in entries:
+        latest[(model_name, object_id)] = action
+
+    ids_by_model: Dict[str, List[int]] = {}
+    for (model_name, object_id), action in latest.items():
+        if action == 'upsert':
+            ids_by_model.setdefault(model_name, []).append(object_id)
+    rows = {}
+    for model_name, ids in ids_by_model.items():
+        for row in SYNC_MODELS[model_name].objects.filter(pk__in=ids).values():
+            rows[(model_name, row['id'])] = row
+
+    changes = []
+    for (model_name, object_id), action in latest.items():
+        row: Optional[Dict] = rows.get((model_name, object_id))
+        if row is None:
+            # 已删除（或在本批日志之后被删除）的对象返回墓碑
+            changes.append({"model": model_name, "id": object_id, "deleted": True})
+        else:
+            changes.append({"model": model_name, "id": object_id, "deleted": False, "data": row})
+
+    return {
+        "token": entries[-1][0] if entries else token,
+        "has_more": has_more,
+        "changes": changes,
+    }
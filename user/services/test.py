@@ -1,12 +1,17 @@
-from typing import List, Dict, Tuple
+import json
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 
 from dateutil.relativedelta import relativedelta
 
 from user.services.parser import ScheduleParser
 
+# 固定的参考时间：评估结果不随运行日期变化，可以缓存和横向比较
+REFERENCE_NOW = datetime(2025, 3, 12, 9, 0, 0)
 
-def evaluate_all(parser: ScheduleParser, test_cases: List[Tuple[str, Dict]]) -> Dict:
+
+def evaluate_all(parser: ScheduleParser, test_cases: List[Tuple[str, Dict]],
+                 now: Optional[datetime] = REFERENCE_NOW) -> Dict:
     metrics = {
         "time": {"correct": 0, "total": 0, "startTime_correct": 0, "endTime_correct": 0},
 
@@ -20,7 +25,7 @@ def evaluate_all(parser: ScheduleParser, test_cases: List[Tuple[str, Dict]]) ->
 
     for text, expected in test_cases:
 
-        result = parser.parse(text, "evaluator")
+        result = parser.parse(text, "evaluator", now=now)
         case_metrics = {"text": text, "errors": []}
 
         time_errors = 0
@@ -86,7 +91,26 @@ def evaluate_all(parser: ScheduleParser, test_cases: List[Tuple[str, Dict]]) ->
     return metrics
 
 
+def load_test_cases(path: str) -> Tuple[datetime, List[Tuple[str, Dict]]]:
+    # 语料文件格式：{"reference_now": "...", "cases": [{"text": ..., "expected": {...}}, ...]}
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    now = datetime.strptime(data["reference_now"], "%Y-%m-%d %H:%M:%S")
+    return now, [(case["text"], case["expected"]) for case in data["cases"]]
+
+
+def dump_test_cases(path: str, now: datetime, cases: List[Tuple[str, Dict]]) -> None:
+    data = {
+        "reference_now": now.strftime("%Y-%m-%d %H:%M:%S"),
+        "cases": [{"text": text, "expected": expected} for text, expected in cases],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+
+
 def print_full_report(metrics: Dict):
+    total = len(metrics['case_details'])
     print("\n" + "=" * 80)
     print("调度文本解析综合评估报告".center(70))
     print("=" * 80)
@@ -94,12 +118,12 @@ def print_full_report(metrics: Dict):
     # 时间解析报告
     print("\n【时间解析】")
     print(f"- 总体准确率: {metrics['time']['accuracy']:.2%}")
-    print(f"- 开始时间正确率: {metrics['time']['startTime_correct'] / len(test_cases):.2%}")
+    print(f"- 开始时间正确率: {metrics['time']['startTime_correct'] / total:.2%}")
 
     # 任务内容报告
     print("\n【任务内容】")
-    print(f"- 完全匹配率: {metrics['content']['exact_match'] / len(test_cases):.2%}")
-    print(f"- 动作动词准确率: {metrics['content']['action_verb_correct'] / len(test_cases):.2%}")
+    print(f"- 完全匹配率: {metrics['content']['exact_match'] / total:.2%}")
+    print(f"- 动作动词准确率: {metrics['content']['action_verb_correct'] / total:.2%}")
 
     # 资源识别报告
     print("\n【资源识别】")
@@ -115,338 +139,341 @@ def print_full_report(metrics: Dict):
             print("错误类型: " + ", ".join(case['errors']))
 
 
-now = datetime.now()
-today = now.strftime("%Y-%m-%d")
-tomorrow = (now + timedelta(days=1)).strftime("%Y-%m-%d")
-next_day = (now + timedelta(days=2)).strftime("%Y-%m-%d")
-test_cases = [
-    (
-        "明天下午3点在实验室进行设备调试",
-        {
-            "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=15, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=17, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "进行设备调试",
-            "resource": ["实验室"]
-        }
-    ),
-    (
-        "明天上午10点-11点在会议室讨论项目进展",
-        {
-            "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=10, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=11, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "讨论项目进展",
-            "resource": ["会议室"]
-        }
-    ),
-    (
-        "今天晚上8点部署新版系统，预计需要2小时",
-        {
-            "startTime": now.replace(hour=20, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
-            "endTime": (now.replace(hour=20, minute=0, second=0) + timedelta(hours=2)).strftime("%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "部署新版系统",
-            "resource": []
-        }
-    ),
-    (
-        "后天下午2点评估市场调研结果",
-        {
-            "startTime": datetime.strptime(next_day, "%Y-%m-%d").replace(hour=14, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": datetime.strptime(next_day, "%Y-%m-%d").replace(hour=15, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "评估市场调研结果",
-            "resource": []
-        }
-    ),
-    (
-        "紧急处理打印机故障，尽快恢复使用",
-        {
-            "startTime": now.replace(hour=14, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
-            "endTime": (now.replace(hour=14, minute=0, second=0) + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "处理打印机故障",
-            "resource": ["打印机"]
-        }
-    ),
-    (
-        "下周三下午3点至5点审核财务报表",
-        {
-            "startTime": (now + timedelta(days=(2 - now.weekday()) % 7 + 7)).replace(hour=15, minute=0,
-                                                                                     second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": (now + timedelta(days=(2 - now.weekday()) % 7 + 7)).replace(hour=17, minute=0,
-                                                                                   second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "审核财务报表",
-            "resource": []
-        }
-    ),
-    (
-        "今天下午和导师讨论毕业论文修改建议",
-        {
-            "startTime": now.replace(hour=14, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
-            "endTime": (now.replace(hour=14, minute=0, second=0) + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "讨论毕业论文修改建议",
-            "resource": []
-        }
-    ),
-    (
-        "今晚9点在语音室练习英语口语",
-        {
-            "startTime": now.replace(hour=21, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
-            "endTime": (now.replace(hour=21, minute=0, second=0) + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "练习英语口语",
-            "resource": ["语音室"]
-        }
-    ),
-    (
-        "下个月15号下午14:00-16:00组织教室卫生检查",
-        {
-            "startTime": (now + relativedelta(months=1)).replace(day=15, hour=14, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": (now + relativedelta(months=1)).replace(day=15, hour=16, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "组织教室卫生检查",
-            "resource": ["教室"]
-        }
-    ),
-    (
-        "下下周一下午四点给学生讲解实验原理",
-        {
-            "startTime": (now + timedelta(days=(0 - now.weekday()) % 7 + 7)).replace(hour=16, minute=0,
-                                                                                      second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": (now + timedelta(days=(0 - now.weekday()) % 7 + 7)).replace(hour=17, minute=0,
-                                                                                    second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "讲解实验原理",
-            "resource": []
-        }
-    ),
-    (
-        "周五晚上7点开部门会议",
-        {
-            "startTime": (now + timedelta(days=(4 - now.weekday()) % 7)).replace(hour=19, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": (now + timedelta(days=(4 - now.weekday()) % 7)).replace(hour=20, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "开部门会议",
-            "resource": []
-        }
-    ),
-    (
-        "今晚10点检查服务器状态",
-        {
-            "startTime": now.replace(hour=22, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
-            "endTime": (now.replace(hour=22, minute=0, second=0) + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "检查服务器状态",
-            "resource": ["服务器"]
-        }
-    ),
-    (
-        "下周一上午9点准备讲座PPT",
-        {
-            "startTime": (now + timedelta(days=(0 - now.weekday()) % 7)).replace(hour=9, minute=0,
-                                                                                     second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": (now + timedelta(days=(0 - now.weekday()) % 7)).replace(hour=10, minute=0,
-                                                                                   second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "准备讲座PPT",
-            "resource": []
-        }
-    ),
-    (
-        "今天下午5点半和家人视频通话",
-        {
-            "startTime": now.replace(hour=17, minute=30, second=0).strftime("%Y-%m-%d %H:%M:%S"),
-            "endTime": (now.replace(hour=17, minute=30, second=0) + timedelta(minutes=30)).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "和家人视频通话",
-            "resource": []
-        }
-    ),
-    (
-        "明天早上8点开车送孩子上学",
-        {
-            "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=8, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=8, minute=30, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "送孩子上学",
-            "resource": ["车"]
-        }
-    ),
-    (
-        "明天下午两点到三点半参加培训",
-        {
-            "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=14, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=15, minute=30, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "参加培训",
-            "resource": []
-        }
-    ),
-    (
-        "今晚整理文件归档",
-        {
-            "startTime": now.replace(hour=19, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
-            "endTime": (now.replace(hour=20, minute=0, second=0) + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "整理文件归档",
-            "resource": []
-        }
-    ),
-    (
-        "后天上午9点-12点举行招聘面试",
-        {
-            "startTime": datetime.strptime(next_day, "%Y-%m-%d").replace(hour=9, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": datetime.strptime(next_day, "%Y-%m-%d").replace(hour=12, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "举行招聘面试",
-            "resource": []
-        }
-    ),
-    (
-        "下周五在图书馆查阅文献",
-        {
-            "startTime": (now + timedelta(days=(4 - now.weekday()) % 7 + 7)).replace(hour=14, minute=0,
-                                                                                     second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": (now + timedelta(days=(4 - now.weekday()) % 7 + 7)).replace(hour=15, minute=0,
-                                                                                   second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "查阅文献",
-            "resource": ["图书馆"]
-        }
-    ),
-    (
-        "每周三晚上健身1小时",
-        {
-            "startTime": (now + timedelta(days=(2 - now.weekday()) % 7)).replace(hour=19, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": (now + timedelta(days=(2 - now.weekday()) % 7)).replace(hour=20, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "健身",
-            "resource": []
-        }
-    ),
-    (
-        "周六早上看牙医",
-        {
-            "startTime": (now + timedelta(days=(5 - now.weekday()) % 7)).replace(hour=9, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": (now + timedelta(days=(5 - now.weekday()) % 7)).replace(hour=10, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "看牙医",
-            "resource": ["牙医"]
-        }
-    ),
-    (
-        "明天上午整理报销单据",
-        {
-            "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=9, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=10, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "整理报销单据",
-            "resource": []
-        }
-    ),
-    (
-        "本周日参加朋友婚礼",
-        {
-            "startTime": (now + timedelta(days=(6 - now.weekday()) % 7)).replace(hour=10, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": (now + timedelta(days=(6 - now.weekday()) % 7)).replace(hour=13, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "参加朋友婚礼",
-            "resource": []
-        }
-    ),
-    (
-        "下下周二晚上辅导孩子数学作业",
-        {
-            "startTime": (now + timedelta(days=(1 - now.weekday()) + 14)).replace(hour=19, minute=0,
-                                                                                      second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": (now + timedelta(days=(1 - now.weekday()) + 14)).replace(hour=20, minute=0,
-                                                                                    second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "辅导孩子数学作业",
-            "resource": []
-        }
-    ),
-    (
-        "今天下午四点半开远程会议",
-        {
-            "startTime": now.replace(hour=16, minute=30, second=0).strftime("%Y-%m-%d %H:%M:%S"),
-            "endTime": (now.replace(hour=16, minute=30, second=0) + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "开远程会议",
-            "resource": []
-        }
-    ),
-    (
-        "明天下午修改技术文档",
-        {
-            "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=14, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=15, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "修改技术文档",
-            "resource": []
-        }
-    ),
-    (
-        "周三上午测试新功能模块",
-        {
-            "startTime": (now + timedelta(days=(2 - now.weekday()) % 7)).replace(hour=9, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": (now + timedelta(days=(2 - now.weekday()) % 7)).replace(hour=11, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "测试新功能模块",
-            "resource": []
-        }
-    ),
-    (
-        "明天晚上回访客户反馈",
-        {
-            "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=19, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=20, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "回访客户反馈",
-            "resource": []
-        }
-    ),
-    (
-        "下午3点在301会议室进行项目评审",
-        {
-            "startTime": datetime.now().replace(hour=15, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
-            "endTime": (datetime.now().replace(hour=15, minute=0, second=0) + timedelta(hours=2)).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "进行项目评审",
-            "resource": ["会议室"]
-        }
-    ),
-    (
-        "明天上午10点提交季度报告",
-        {
-            "startTime": (datetime.now() + timedelta(days=1)).replace(hour=10, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "endTime": (datetime.now() + timedelta(days=1)).replace(hour=11, minute=0, second=0).strftime(
-                "%Y-%m-%d %H:%M:%S"),
-            "scheduleContent": "提交季度报告",
-            "resource": []
-        }
-    ),
-]
+def build_test_cases(now: datetime) -> List[Tuple[str, Dict]]:
+    today = now.strftime("%Y-%m-%d")
+    tomorrow = (now + timedelta(days=1)).strftime("%Y-%m-%d")
+    next_day = (now + timedelta(days=2)).strftime("%Y-%m-%d")
+    return [
+        (
+            "明天下午3点在实验室进行设备调试",
+            {
+                "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=15, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=17, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "进行设备调试",
+                "resource": ["实验室"]
+            }
+        ),
+        (
+            "明天上午10点-11点在会议室讨论项目进展",
+            {
+                "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=10, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=11, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "讨论项目进展",
+                "resource": ["会议室"]
+            }
+        ),
+        (
+            "今天晚上8点部署新版系统，预计需要2小时",
+            {
+                "startTime": now.replace(hour=20, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
+                "endTime": (now.replace(hour=20, minute=0, second=0) + timedelta(hours=2)).strftime("%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "部署新版系统",
+                "resource": []
+            }
+        ),
+        (
+            "后天下午2点评估市场调研结果",
+            {
+                "startTime": datetime.strptime(next_day, "%Y-%m-%d").replace(hour=14, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": datetime.strptime(next_day, "%Y-%m-%d").replace(hour=15, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "评估市场调研结果",
+                "resource": []
+            }
+        ),
+        (
+            "紧急处理打印机故障，尽快恢复使用",
+            {
+                "startTime": now.replace(hour=14, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
+                "endTime": (now.replace(hour=14, minute=0, second=0) + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "处理打印机故障",
+                "resource": ["打印机"]
+            }
+        ),
+        (
+            "下周三下午3点至5点审核财务报表",
+            {
+                "startTime": (now + timedelta(days=(2 - now.weekday()) % 7 + 7)).replace(hour=15, minute=0,
+                                                                                         second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": (now + timedelta(days=(2 - now.weekday()) % 7 + 7)).replace(hour=17, minute=0,
+                                                                                       second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "审核财务报表",
+                "resource": []
+            }
+        ),
+        (
+            "今天下午和导师讨论毕业论文修改建议",
+            {
+                "startTime": now.replace(hour=14, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
+                "endTime": (now.replace(hour=14, minute=0, second=0) + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "讨论毕业论文修改建议",
+                "resource": []
+            }
+        ),
+        (
+            "今晚9点在语音室练习英语口语",
+            {
+                "startTime": now.replace(hour=21, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
+                "endTime": (now.replace(hour=21, minute=0, second=0) + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "练习英语口语",
+                "resource": ["语音室"]
+            }
+        ),
+        (
+            "下个月15号下午14:00-16:00组织教室卫生检查",
+            {
+                "startTime": (now + relativedelta(months=1)).replace(day=15, hour=14, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": (now + relativedelta(months=1)).replace(day=15, hour=16, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "组织教室卫生检查",
+                "resource": ["教室"]
+            }
+        ),
+        (
+            "下下周一下午四点给学生讲解实验原理",
+            {
+                "startTime": (now + timedelta(days=(0 - now.weekday()) % 7 + 7)).replace(hour=16, minute=0,
+                                                                                          second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": (now + timedelta(days=(0 - now.weekday()) % 7 + 7)).replace(hour=17, minute=0,
+                                                                                        second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "讲解实验原理",
+                "resource": []
+            }
+        ),
+        (
+            "周五晚上7点开部门会议",
+            {
+                "startTime": (now + timedelta(days=(4 - now.weekday()) % 7)).replace(hour=19, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": (now + timedelta(days=(4 - now.weekday()) % 7)).replace(hour=20, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "开部门会议",
+                "resource": []
+            }
+        ),
+        (
+            "今晚10点检查服务器状态",
+            {
+                "startTime": now.replace(hour=22, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
+                "endTime": (now.replace(hour=22, minute=0, second=0) + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "检查服务器状态",
+                "resource": ["服务器"]
+            }
+        ),
+        (
+            "下周一上午9点准备讲座PPT",
+            {
+                "startTime": (now + timedelta(days=(0 - now.weekday()) % 7)).replace(hour=9, minute=0,
+                                                                                         second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": (now + timedelta(days=(0 - now.weekday()) % 7)).replace(hour=10, minute=0,
+                                                                                       second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "准备讲座PPT",
+                "resource": []
+            }
+        ),
+        (
+            "今天下午5点半和家人视频通话",
+            {
+                "startTime": now.replace(hour=17, minute=30, second=0).strftime("%Y-%m-%d %H:%M:%S"),
+                "endTime": (now.replace(hour=17, minute=30, second=0) + timedelta(minutes=30)).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "和家人视频通话",
+                "resource": []
+            }
+        ),
+        (
+            "明天早上8点开车送孩子上学",
+            {
+                "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=8, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=8, minute=30, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "送孩子上学",
+                "resource": ["车"]
+            }
+        ),
+        (
+            "明天下午两点到三点半参加培训",
+            {
+                "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=14, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=15, minute=30, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "参加培训",
+                "resource": []
+            }
+        ),
+        (
+            "今晚整理文件归档",
+            {
+                "startTime": now.replace(hour=19, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
+                "endTime": (now.replace(hour=20, minute=0, second=0) + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "整理文件归档",
+                "resource": []
+            }
+        ),
+        (
+            "后天上午9点-12点举行招聘面试",
+            {
+                "startTime": datetime.strptime(next_day, "%Y-%m-%d").replace(hour=9, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": datetime.strptime(next_day, "%Y-%m-%d").replace(hour=12, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "举行招聘面试",
+                "resource": []
+            }
+        ),
+        (
+            "下周五在图书馆查阅文献",
+            {
+                "startTime": (now + timedelta(days=(4 - now.weekday()) % 7 + 7)).replace(hour=14, minute=0,
+                                                                                         second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": (now + timedelta(days=(4 - now.weekday()) % 7 + 7)).replace(hour=15, minute=0,
+                                                                                       second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "查阅文献",
+                "resource": ["图书馆"]
+            }
+        ),
+        (
+            "每周三晚上健身1小时",
+            {
+                "startTime": (now + timedelta(days=(2 - now.weekday()) % 7)).replace(hour=19, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": (now + timedelta(days=(2 - now.weekday()) % 7)).replace(hour=20, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "健身",
+                "resource": []
+            }
+        ),
+        (
+            "周六早上看牙医",
+            {
+                "startTime": (now + timedelta(days=(5 - now.weekday()) % 7)).replace(hour=9, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": (now + timedelta(days=(5 - now.weekday()) % 7)).replace(hour=10, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "看牙医",
+                "resource": ["牙医"]
+            }
+        ),
+        (
+            "明天上午整理报销单据",
+            {
+                "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=9, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=10, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "整理报销单据",
+                "resource": []
+            }
+        ),
+        (
+            "本周日参加朋友婚礼",
+            {
+                "startTime": (now + timedelta(days=(6 - now.weekday()) % 7)).replace(hour=10, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": (now + timedelta(days=(6 - now.weekday()) % 7)).replace(hour=13, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "参加朋友婚礼",
+                "resource": []
+            }
+        ),
+        (
+            "下下周二晚上辅导孩子数学作业",
+            {
+                "startTime": (now + timedelta(days=(1 - now.weekday()) + 14)).replace(hour=19, minute=0,
+                                                                                          second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": (now + timedelta(days=(1 - now.weekday()) + 14)).replace(hour=20, minute=0,
+                                                                                        second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "辅导孩子数学作业",
+                "resource": []
+            }
+        ),
+        (
+            "今天下午四点半开远程会议",
+            {
+                "startTime": now.replace(hour=16, minute=30, second=0).strftime("%Y-%m-%d %H:%M:%S"),
+                "endTime": (now.replace(hour=16, minute=30, second=0) + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "开远程会议",
+                "resource": []
+            }
+        ),
+        (
+            "明天下午修改技术文档",
+            {
+                "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=14, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=15, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "修改技术文档",
+                "resource": []
+            }
+        ),
+        (
+            "周三上午测试新功能模块",
+            {
+                "startTime": (now + timedelta(days=(2 - now.weekday()) % 7)).replace(hour=9, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": (now + timedelta(days=(2 - now.weekday()) % 7)).replace(hour=11, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "测试新功能模块",
+                "resource": []
+            }
+        ),
+        (
+            "明天晚上回访客户反馈",
+            {
+                "startTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=19, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": datetime.strptime(tomorrow, "%Y-%m-%d").replace(hour=20, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "回访客户反馈",
+                "resource": []
+            }
+        ),
+        (
+            "下午3点在301会议室进行项目评审",
+            {
+                "startTime": now.replace(hour=15, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
+                "endTime": (now.replace(hour=15, minute=0, second=0) + timedelta(hours=2)).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "进行项目评审",
+                "resource": ["会议室"]
+            }
+        ),
+        (
+            "明天上午10点提交季度报告",
+            {
+                "startTime": (now + timedelta(days=1)).replace(hour=10, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "endTime": (now + timedelta(days=1)).replace(hour=11, minute=0, second=0).strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                "scheduleContent": "提交季度报告",
+                "resource": []
+            }
+        ),
+    ]
+
+
+test_cases = build_test_cases(REFERENCE_NOW)
 
 if __name__ == "__main__":
     parser = ScheduleParser()
-    metrics = evaluate_all(parser, test_cases)
+    metrics = evaluate_all(parser, test_cases, REFERENCE_NOW)
     print_full_report(metrics)
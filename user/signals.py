@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from user import models
+from user.services.groups import invalidate_group, invalidate_user
+from user.services.sync import SYNC_SCOPES, record_change
+
+
+@receiver([post_save, post_delete], sender=models.TeamMember)
+def team_member_changed(sender, instance, **kwargs):
+    invalidate_user(instance.username)
+
+
+@receiver([post_save, post_delete], sender=models.TeamGroup)
+def team_group_changed(sender, instance, **kwargs):
+    invalidate_group(instance.groupID)
+
+
+def sync_saved(sender, instance, **kwargs):
+    record_change(instance, 'upsert')
+
+
+def sync_deleted(sender, instance, **kwargs):
+    record_change(instance, 'delete')
+
+
+for model in SYNC_SCOPES:
+    post_save.connect(sync_saved, sender=model, dispatch_uid=f'sync-save-{model._meta.model_name}')
+    post_delete.connect(sync_deleted, sender=model, dispatch_uid=f'sync-delete-{model._meta.model_name}')
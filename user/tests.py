@@ -1,3 +1,583 @@
-from django.test import TestCase
+import json
+import random
+import re
+import threading
+import unittest
+from copy import copy
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+import numpy as np
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import OuterRef, Q, Subquery
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from user import models
+from user.models import Schedule
+from user.resource.fitness import ScheduleTable, vectorized_fitness
+from user.resource.interval_index import ScheduleIndex, naive
+from user.resource.scheduler import affected_component, check_conflicts, fitness, genetic_algorithm
+from user.resource.solvers import solve
+from user.resource.storage import (StaleScheduleError, conflict_candidates, reschedule_candidates, take_snapshot,
+                                   write_back)
+from user.services.cache import ParseCache
+from user.services.calendar import CLASS_RANK, InvalidCursor, calendar_page
+from user.services.groups import get_group_info_list
+from user.services.parser import ScheduleParser
+from user.services.pool import in_worker_process, pool_enabled, warm_up_services
+from user.services.sync import changes_since, current_token
+
+
+def random_schedules(rng, n, base=datetime(2025, 5, 12, 8, 0)):
+    schedules = []
+    for _ in range(n):
+        start = base + timedelta(minutes=15 * rng.randint(0, 200))
+        if rng.random() < 0.2:
+            start = start.replace(tzinfo=timezone.utc)
+        schedule = Schedule(
+            executor=rng.choice(["u1", "u2", "u3", "u4"]),
+            resource=rng.choice([None, "会议室", "投影仪", "实验室"]),
+            scheduleContent="task",
+            startTime=start,
+            endTime=start + timedelta(minutes=15 * rng.randint(0, 12)),
+            priority=rng.randint(1, 3),
+        )
+        if rng.random() < 0.3:
+            schedule.original_startTime = start - timedelta(minutes=rng.randint(-90, 90))
+        schedules.append(schedule)
+    return schedules
+
+
+class VectorizedFitnessTests(SimpleTestCase):
+    def test_matches_reference_fitness(self):
+        rng = random.Random(7)
+        for n in (0, 1, 2, 5, 30, 120):
+            for _ in range(5):
+                schedules = random_schedules(rng, n)
+                self.assertAlmostEqual(vectorized_fitness(schedules), fitness(schedules), places=6)
+
+    def test_sweep_matches_dense(self):
+        rng = random.Random(11)
+        for _ in range(5):
+            schedules = random_schedules(rng, 150)
+            dense = ScheduleTable(schedules)
+            sweep = ScheduleTable(schedules, dense_limit=0)
+            self.assertAlmostEqual(sweep.score(), dense.score(), places=6)
+            self.assertAlmostEqual(sweep.score(), fitness(schedules), places=6)
+
+    def test_delta_matches_full(self):
+        rng = random.Random(5)
+        np_rng = np.random.default_rng(5)
+        for dense_limit in (1024, 0):
+            for _ in range(20):
+                table = ScheduleTable(random_schedules(rng, 80), dense_limit=dense_limit)
+                old = table.start.copy()
+                moved = np.unique(np_rng.integers(0, 80, size=5))
+                new = old.copy()
+                new[moved] += np_rng.integers(-8, 8, size=len(moved)) * 15 * 60 * 1_000_000
+                self.assertEqual(
+                    table.conflict_penalty(old) + table.conflict_delta(old, new, moved),
+                    table.conflict_penalty(new),
+                )
+
+
+class ScheduleIndexTests(SimpleTestCase):
+    @staticmethod
+    def linear_conflicts(schedules, target):
+        start, end = naive(target.startTime), naive(target.endTime)
+        return sorted(
+            s.scheduleContent for s in schedules
+            if s is not target and start < naive(s.endTime) and end > naive(s.startTime)
+            and (s.resource == target.resource or s.executor == target.executor)
+        )
+
+    def test_incremental_updates_match_linear_scan(self):
+        rng = random.Random(17)
+        pool = random_schedules(rng, 400)
+        for i, schedule in enumerate(pool):
+            schedule.scheduleContent = str(i)
+        live = pool[:100]
+        index = ScheduleIndex(live)
+        for step in range(300):
+            op = rng.random()
+            if op < 0.35 and len(live) < len(pool):
+                schedule = rng.choice([s for s in pool if s not in index])
+                index.add(schedule)
+                live.append(schedule)
+            elif op < 0.6 and live:
+                schedule = live.pop(rng.randrange(len(live)))
+                index.discard(schedule)
+            elif live:
+                # 挪动时保留或去掉时区，覆盖 naive/aware 混用的情况
+                schedule = rng.choice(live)
+                shift = timedelta(minutes=15 * rng.randint(-40, 40))
+                start = naive(schedule.startTime) + shift
+                if rng.random() < 0.3:
+                    start = start.replace(tzinfo=timezone.utc)
+                schedule.endTime = start + (naive(schedule.endTime) - naive(schedule.startTime))
+                schedule.startTime = start
+                index.move(schedule)
+            self.assertEqual(len(index), len(live))
+            for target in rng.sample(pool, 5):
+                self.assertEqual(sorted(c["content"] for c in check_conflicts(index, target)),
+                                 self.linear_conflicts(live, target), step)
+
+
+class ParseCacheTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.parser = ScheduleParser(cache=ParseCache(maxsize=16))
+
+    def setUp(self):
+        self.parser.cache.clear()
+
+    def test_relative_phrase_resolves_per_reference_date(self):
+        # 跨过零点后“明天”指向新的日期，不能命中前一天的缓存
+        before = self.parser.parse('明天上午10点开会', 'u1', datetime(2025, 5, 12, 23, 59))
+        after = self.parser.parse('明天上午10点开会', 'u1', datetime(2025, 5, 13, 0, 1))
+        self.assertEqual(before["startTime"], '2025-05-13 10:00:00')
+        self.assertEqual(after["startTime"], '2025-05-14 10:00:00')
+        self.assertNotEqual(after["extractionTier"], 'cache')
+        self.assertEqual(self.parser.cache.stats()["misses"], 2)
+
+    def test_hit_uses_requesting_executor(self):
+        now = datetime(2025, 5, 12, 9)
+        first = self.parser.parse('明天上午10点开会', 'u1', now)
+        second = self.parser.parse('明天上午10点开会', 'u2', now)
+        self.assertEqual(second["extractionTier"], 'cache')
+        self.assertEqual(second["executor"], 'u2')
+        self.assertEqual(first["executor"], 'u1')
+        self.assertEqual(second["startTime"], first["startTime"])
+
+    def test_lru_eviction(self):
+        cache = ParseCache(maxsize=2)
+        day = datetime(2025, 5, 12).date()
+        cache.set(cache.key('a', day), {"v": 'a'})
+        cache.set(cache.key('b', day), {"v": 'b'})
+        cache.get(cache.key('a', day))
+        cache.set(cache.key('c', day), {"v": 'c'})
+        self.assertIsNone(cache.get(cache.key('b', day)))
+        self.assertEqual(cache.get(cache.key('a', day)), {"v": 'a'})
+        self.assertEqual(cache.get(cache.key('c', day)), {"v": 'c'})
+        self.assertEqual(cache.stats()["size"], 2)
+
+    def test_ttl_expiry(self):
+        cache = ParseCache(ttl=60)
+        key = cache.key('a', datetime(2025, 5, 12).date())
+        with mock.patch('user.services.cache.time.monotonic', return_value=1000.0):
+            cache.set(key, {"v": 'a'})
+        with mock.patch('user.services.cache.time.monotonic', return_value=1059.0):
+            self.assertEqual(cache.get(key), {"v": 'a'})
+        with mock.patch('user.services.cache.time.monotonic', return_value=1061.0):
+            self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.stats()["size"], 0)
+
+
+class WriteBackTests(TestCase):
+    def setUp(self):
+        self.x = Schedule.objects.create(executor='A', resource='R2', scheduleContent='X', priority=1,
+                                         startTime=datetime(2025, 5, 12, 10), endTime=datetime(2025, 5, 12, 11))
+        self.y = Schedule.objects.create(executor='A', resource='R3', scheduleContent='Y', priority=1,
+                                         startTime=datetime(2025, 5, 12, 13), endTime=datetime(2025, 5, 12, 14))
+
+    def moved(self, schedules, hours):
+        result = []
+        for schedule in schedules:
+            schedule = copy(schedule)
+            schedule.startTime += timedelta(hours=hours)
+            schedule.endTime += timedelta(hours=hours)
+            result.append(schedule)
+        return result
+
+    def assertNothingWritten(self, expected):
+        self.assertEqual(
+            sorted(Schedule.objects.values_list('scheduleContent', 'startTime')),
+            sorted((schedule.scheduleContent, schedule.startTime) for schedule in expected),
+        )
+
+    def test_changed_row_is_not_overwritten(self):
+        loaded = list(Schedule.objects.all())
+        snapshot = take_snapshot(loaded)
+        Schedule.objects.filter(pk=self.x.pk).update(startTime=datetime(2025, 5, 12, 15, tzinfo=timezone.utc))
+        concurrent = list(Schedule.objects.all())
+        log_size = models.ChangeLog.objects.count()
+
+        new = Schedule(executor='A', resource='R1', scheduleContent='N',
+                       startTime=datetime(2025, 5, 12, 10), endTime=datetime(2025, 5, 12, 11))
+        with self.assertRaises(StaleScheduleError) as raised:
+            write_back(Schedule, self.moved(loaded, 1) + [new], snapshot)
+        self.assertEqual(raised.exception.ids, [self.x.pk])
+        self.assertNothingWritten(concurrent)
+        self.assertEqual(models.ChangeLog.objects.count(), log_size)
+
+    def test_deleted_row_is_not_resurrected(self):
+        loaded = list(Schedule.objects.all())
+        snapshot = take_snapshot(loaded)
+        Schedule.objects.filter(pk=self.y.pk).delete()
+
+        with self.assertRaises(StaleScheduleError):
+            write_back(Schedule, self.moved(loaded, 1), snapshot)
+        self.assertNothingWritten([schedule for schedule in loaded if schedule.pk != self.y.pk])
+
+    def test_adjust_schedule_returns_409(self):
+        def solve_after_concurrent_edit(*args, **kwargs):
+            # 模拟另一个请求在加载之后、写回之前修改了日程
+            Schedule.objects.filter(pk=self.x.pk).update(startTime=datetime(2025, 5, 12, 15, tzinfo=timezone.utc))
+            return solve(*args, **kwargs)
+
+        shanghai = ZoneInfo("Asia/Shanghai")
+        body = {
+            "class": "personal", "content": "N", "resource": "R1", "executor": "A", "priority": 3,
+            "startTime": datetime(2025, 5, 12, 10, tzinfo=shanghai).timestamp(),
+            "endTime": datetime(2025, 5, 12, 11, tzinfo=shanghai).timestamp(),
+        }
+        with mock.patch('user.views.solve', side_effect=solve_after_concurrent_edit):
+            response = self.client.post('/api/adjustSchedule/', json.dumps(body), content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Schedule.objects.filter(scheduleContent='N').exists())
+        self.assertEqual(Schedule.objects.get(pk=self.x.pk).startTime,
+                         datetime(2025, 5, 12, 15, tzinfo=timezone.utc))
+
+
+class AffectedComponentTests(SimpleTestCase):
+    def test_component_solve_matches_full_solve(self):
+        # 输入包含全部日程（自然满足闭包前提）时，只优化分量与优化全集得到相同的安排
+        rng = random.Random(3)
+        for _ in range(4):
+            schedules = random_schedules(rng, 15)
+            for i, schedule in enumerate(schedules):
+                schedule.scheduleContent = str(i)
+            new = Schedule(executor='u1', resource='会议室', scheduleContent='new', priority=3,
+                           startTime=datetime(2025, 5, 12, 10), endTime=datetime(2025, 5, 12, 11))
+            component, rest = affected_component(schedules, new)
+            for solver in ('greedy', 'branch_and_bound'):
+                full = solve(schedules, new, solver=solver)
+                partial = solve(component, new, solver=solver) + rest
+                self.assertEqual(
+                    sorted((s.scheduleContent, naive(s.startTime)) for s in partial),
+                    sorted((s.scheduleContent, naive(s.startTime)) for s in full),
+                    solver,
+                )
+                self.assertAlmostEqual(fitness(partial), fitness(full), places=6)
+
+
+class ExecutorBackendTests(SimpleTestCase):
+    def test_same_seed_gives_same_result_on_every_backend(self):
+        rng = random.Random(13)
+        schedules = random_schedules(rng, 80)
+        new = Schedule(executor='u1', resource='会议室', scheduleContent='new', priority=3,
+                       startTime=datetime(2025, 5, 12, 10), endTime=datetime(2025, 5, 12, 12))
+
+        def placements(**options):
+            result = genetic_algorithm(schedules, new, seed=5, population_size=16, **options)
+            return [naive(s.startTime) for s in result]
+
+        expected = placements(backend='serial')
+        for backend, workers in (('thread', 2), ('thread', 4), ('process', 2)):
+            self.assertEqual(placements(backend=backend, workers=workers), expected, (backend, workers))
+
+
+class SolverDispatchTests(SimpleTestCase):
+    def test_auto_is_never_worse_than_greedy(self):
+        rng = random.Random(5)
+        for n in (5, 20, 60, 150):
+            for _ in range(5):
+                schedules = random_schedules(rng, n)
+                start = datetime(2025, 5, 12, 8) + timedelta(minutes=15 * rng.randint(0, 200))
+                new = Schedule(executor=rng.choice(["u1", "u2"]), resource=rng.choice([None, "会议室"]),
+                               scheduleContent="new", priority=rng.randint(2, 3),
+                               startTime=start, endTime=start + timedelta(minutes=15 * rng.randint(1, 8)))
+                auto = solve(schedules, new, solver='auto', seed=0)
+                greedy = solve(schedules, new, solver='greedy')
+                self.assertGreaterEqual(fitness(auto), fitness(greedy) - 1e-6)
+
+
+class ParserPoolTests(SimpleTestCase):
+    @override_settings(SMART_INPUT_POOL={'WORKERS': 2})
+    def test_multiprocessing_web_worker_keeps_pool(self):
+        # 由 multiprocessing 启动的 Web worker 不是解析池 worker，仍应启用进程池
+        with mock.patch('multiprocessing.parent_process', return_value=object()):
+            self.assertFalse(in_worker_process())
+            self.assertTrue(pool_enabled())
+        with mock.patch('user.services.pool._in_worker', True):
+            self.assertFalse(pool_enabled())
+
+
+class ParserWarmUpTests(SimpleTestCase):
+    def test_management_commands_do_not_warm_up(self):
+        # 测试运行器只执行了 ready()，不应在后台加载 jiagu 模型
+        self.assertNotIn('schedule-parser-warmup', [thread.name for thread in threading.enumerate()])
+
+    @override_settings(SCHEDULE_PARSER_WARMUP=True)
+    def test_serving_process_warms_up_parser(self):
+        with mock.patch('user.services.pool.warm_up_parser') as warm_up:
+            warm_up_services()
+            warm_up.assert_called_once_with()
+            with mock.patch('user.services.pool._in_worker', True):
+                warm_up_services()
+            warm_up.assert_called_once_with()
+
+    def test_status_starts_lazy_load_when_cold(self):
+        cold = {"ready": False, "status": "cold", "error": None, "load_seconds": None}
+        with mock.patch('user.views.parser_status', return_value=cold), \
+                mock.patch('user.views.warm_up_parser') as warm_up:
+            response = self.client.get('/api/smart_input/status/')
+        self.assertEqual(response.status_code, 503)
+        warm_up.assert_called_once_with()
+
+        loading = dict(cold, status="loading")
+        with mock.patch('user.views.parser_status', return_value=loading), \
+                mock.patch('user.views.warm_up_parser') as warm_up:
+            self.client.get('/api/smart_input/status/')
+        warm_up.assert_not_called()
+
+
+class RescheduleCandidatesTests(TestCase):
+    def test_loads_neighbors_of_displaced_schedules(self):
+        # X 会被新日程挤开，它在当天挪动时可能撞上与它共享资源 R2 的 Y，Y 必须一并加载
+        x = Schedule.objects.create(executor='A', resource='R2', scheduleContent='X', priority=1,
+                                    startTime=datetime(2025, 5, 12, 10), endTime=datetime(2025, 5, 12, 11))
+        y = Schedule.objects.create(executor='B', resource='R2', scheduleContent='Y', priority=3,
+                                    startTime=datetime(2025, 5, 12, 9), endTime=datetime(2025, 5, 12, 10, 30))
+        new = Schedule(executor='A', resource='R1', scheduleContent='N', priority=3,
+                       startTime=datetime(2025, 5, 12, 10), endTime=datetime(2025, 5, 12, 11))
+
+        candidates = reschedule_candidates(Schedule, new)
+        self.assertCountEqual([schedule.pk for schedule in candidates], [x.pk, y.pk])
+
+        component, _ = affected_component(candidates, new)
+        for solver in ('branch_and_bound', 'auto'):
+            result = solve(component, new, solver=solver)
+            moved = next(schedule for schedule in result if schedule.pk == x.pk)
+            others = [schedule for schedule in result if schedule is not moved]
+            self.assertEqual(check_conflicts(others, moved), [], solver)
+
+
+class GroupEventsTests(TestCase):
+    def setUp(self):
+        models.TeamMember.objects.create(groupID='g1', username='a', memberName='Alice')
+        models.TeamMember.objects.create(groupID='g1', username='b', memberName='Bob')
+        models.TeamMember.objects.create(groupID='g2', username='a', memberName='A2')
+        for hour, executor, state in ((8, 'a', 0), (9, 'b', 1), (10, 'a', 1), (11, 'ghost', 0), (14, 'b', 0)):
+            models.GroupSchedule.objects.create(
+                groupID='g1', executor=executor, scheduleContent=f'{executor}{hour}', state=state,
+                startTime=datetime(2025, 5, 12, hour, tzinfo=timezone.utc),
+                endTime=datetime(2025, 5, 12, hour + 1, tzinfo=timezone.utc))
+        models.GroupSchedule.objects.create(groupID='g2', executor='a', scheduleContent='other',
+                                            startTime=datetime(2025, 5, 12, 8, tzinfo=timezone.utc),
+                                            endTime=datetime(2025, 5, 12, 9, tzinfo=timezone.utc))
+
+    def events(self, **body):
+        response = self.client.post('/api/getGroupEvents/', json.dumps({"groupID": 'g1', **body}),
+                                    content_type='application/json')
+        return {event["content"]: event["executor"] for event in response.json()["groupInfo"]}
+
+    @staticmethod
+    def timestamp(hour):
+        # 前端按东八区传秒级时间戳，视图转换回库中的 naive 时间
+        return datetime(2025, 5, 12, hour, tzinfo=ZoneInfo("Asia/Shanghai")).timestamp()
+
+    def test_single_query_with_member_names(self):
+        with self.assertNumQueries(1):
+            events = self.events()
+        # 执行人已不在群中时 executor 为 null
+        self.assertEqual(events, {'a8': 'Alice', 'b9': 'Bob', 'a10': 'Alice', 'ghost11': None, 'b14': 'Bob'})
+
+    def test_state_and_window_filters(self):
+        self.assertEqual(set(self.events(state=1)), {'b9', 'a10'})
+        self.assertEqual(set(self.events(start=self.timestamp(10), end=self.timestamp(12))), {'a10', 'ghost11'})
+        self.assertEqual(set(self.events(start=self.timestamp(9) + 1800, state=0)), {'ghost11', 'b14'})
+        self.assertEqual(set(self.events(end=self.timestamp(9))), {'a8'})
+
+
+class GroupInfoCacheTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        for group_id in ('g1', 'g2', 'g3'):
+            models.TeamGroup.objects.create(groupID=group_id, groupOwner='owner', groupName=group_id.upper(),
+                                            groupDescription='')
+        models.TeamMember.objects.create(groupID='g1', username='u1', memberName='U1')
+        self.member = models.TeamMember.objects.create(groupID='g2', username='u1', memberName='U1')
+
+    def names(self):
+        return [group["groupName"] for group in get_group_info_list('u1')]
+
+    def test_listing_uses_fixed_queries_then_cache(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.names(), ['G1', 'G2'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names(), ['G1', 'G2'])
+        response = self.client.post('/api/getGroupList/', json.dumps({"username": 'u1'}),
+                                    content_type='application/json')
+        self.assertEqual([group["groupID"] for group in response.json()["groupInfo"]], ['g1', 'g2'])
+
+    def test_member_changes_invalidate(self):
+        self.names()
+        models.TeamMember.objects.create(groupID='g3', username='u1', memberName='U1')
+        with self.assertNumQueries(2):
+            self.assertEqual(self.names(), ['G1', 'G2', 'G3'])
+        self.member.delete()
+        self.assertEqual(self.names(), ['G1', 'G3'])
+
+    def test_group_save_invalidates_members(self):
+        self.names()
+        group = models.TeamGroup.objects.get(groupID='g1')
+        group.groupName = 'Renamed'
+        group.save()
+        self.assertEqual(self.names(), ['Renamed', 'G2'])
+
+
+class CalendarPageTests(TestCase):
+    def test_keyset_paging_over_ties(self):
+        # 个人与团队日程大量同一开始时间，小页长翻页时不能漏也不能重
+        models.TeamMember.objects.create(groupID='g1', username='u1', memberName='U1')
+        models.TeamGroup.objects.create(groupID='g1', groupOwner='u1', groupName='G1', groupDescription='')
+        rng = random.Random(2)
+        for i in range(40):
+            start = datetime(2025, 5, 12, 8, tzinfo=timezone.utc) + timedelta(hours=rng.choice([0, 0, 1, 2]))
+            fields = dict(executor=rng.choice(['u1', 'u1', 'u2']), scheduleContent=str(i),
+                          startTime=start, endTime=start + timedelta(hours=1), priority=rng.randint(1, 3))
+            if rng.random() < 0.5:
+                Schedule.objects.create(**fields)
+            else:
+                models.GroupSchedule.objects.create(groupID=rng.choice(['g1', 'g2']), **fields)
+        start, end = datetime(2025, 5, 12, tzinfo=timezone.utc), datetime(2025, 5, 13, tzinfo=timezone.utc)
+
+        expected = sorted(
+            [(s.startTime, 0, s.id) for s in Schedule.objects.filter(executor='u1')]
+            + [(s.startTime, 1, s.id) for s in models.GroupSchedule.objects.filter(groupID='g1', executor='u1')]
+        )
+        for limit in (1, 2, 3, 7):
+            seen, cursor = [], None
+            while True:
+                page = calendar_page('u1', start, end, cursor=cursor, limit=limit)
+                self.assertLessEqual(len(page["events"]), limit)
+                seen += [(e["startTime"], CLASS_RANK[e["class"]], e["id"]) for e in page["events"]]
+                if not page["has_more"]:
+                    break
+                cursor = page["next_cursor"]
+            self.assertEqual(seen, expected, limit)
+
+    def test_filters_and_invalid_cursor(self):
+        Schedule.objects.create(executor='u1', scheduleContent='a', priority=3, state=1,
+                                startTime=datetime(2025, 5, 12, 8, tzinfo=timezone.utc),
+                                endTime=datetime(2025, 5, 12, 9, tzinfo=timezone.utc))
+        Schedule.objects.create(executor='u1', scheduleContent='b', priority=1, state=0,
+                                startTime=datetime(2025, 5, 12, 8, tzinfo=timezone.utc),
+                                endTime=datetime(2025, 5, 12, 9, tzinfo=timezone.utc))
+        start, end = datetime(2025, 5, 12, tzinfo=timezone.utc), datetime(2025, 5, 13, tzinfo=timezone.utc)
+        page = calendar_page('u1', start, end, state=1, priority=3)
+        self.assertEqual([event["content"] for event in page["events"]], ['a'])
+        self.assertEqual(calendar_page('u1', start, end, schedule_class='team')["events"], [])
+        with self.assertRaises(InvalidCursor):
+            calendar_page('u1', start, end, cursor='not-a-cursor')
+
+
+class SyncTests(TestCase):
+    def setUp(self):
+        models.TeamMember.objects.create(groupID='g1', username='u1', memberName='U1')
+        models.TeamMember.objects.create(groupID='g2', username='u2', memberName='U2')
+        self.token = current_token()
+
+    def memo(self, username='u1', content='c'):
+        return models.Memo.objects.create(username=username, title='t', content=content)
+
+    def test_repeated_saves_collapse_to_one_upsert(self):
+        memo = self.memo()
+        for content in ('c1', 'c2', 'c3'):
+            memo.content = content
+            memo.save()
+        result = changes_since('u1', self.token)
+        self.assertEqual(len(result["changes"]), 1)
+        change = result["changes"][0]
+        self.assertEqual((change["model"], change["id"], change["deleted"]), ('memo', memo.id, False))
+        self.assertEqual(change["data"]["content"], 'c3')
+        self.assertEqual(result["token"], current_token())
+        self.assertEqual(changes_since('u1', result["token"])["changes"], [])
+
+    def test_save_then_delete_yields_tombstone(self):
+        memo = self.memo()
+        memo_id = memo.id
+        memo.delete()
+        self.assertEqual(changes_since('u1', self.token)["changes"],
+                         [{"model": 'memo', "id": memo_id, "deleted": True}])
+
+    def test_has_more_pages_through_log(self):
+        memos = [self.memo(content=str(i)) for i in range(5)]
+        seen, token, pages = [], self.token, 0
+        while True:
+            result = changes_since('u1', token, limit=2)
+            pages += 1
+            seen += [change["id"] for change in result["changes"]]
+            token = result["token"]
+            if not result["has_more"]:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, [memo.id for memo in memos])
+
+    def test_changes_are_scoped_to_user_and_groups(self):
+        self.memo(username='u2')
+        models.TeamMemo.objects.create(username='u2', title='t', content='c', groupID='g2')
+        own = models.TeamMemo.objects.create(username='u2', title='t', content='c', groupID='g1')
+        result = changes_since('u1', self.token)
+        self.assertEqual([(c["model"], c["id"]) for c in result["changes"]], [('teammemo', own.id)])
+        self.assertEqual(len(changes_since('u2', self.token)["changes"]), 2)
+
+    def test_sync_view(self):
+        self.memo()
+        response = self.client.post('/api/sync/', json.dumps({"username": 'u1'}), content_type='application/json')
+        self.assertTrue(response.json()["reset"])
+        self.assertEqual(response.json()["token"], current_token())
+        response = self.client.post('/api/sync/', json.dumps({"username": 'u1', "token": self.token}),
+                                    content_type='application/json')
+        self.assertEqual(len(response.json()["changes"]), 1)
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', "查询计划的格式与数据库相关")
+class QueryPlanTests(TestCase):
+    start = datetime(2025, 5, 1)
+    end = datetime(2025, 6, 1)
+
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+        # SQLite 的计划中不带索引的 “SCAN 表名” 即全表扫描（子查询中的表以 U0 等别名出现）
+        scans = [line for line in plan.splitlines() if re.search(r'\bSCAN (?!CONSTANT)', line) and 'INDEX' not in line]
+        self.assertFalse(scans, plan)
+        self.assertIn('INDEX', plan)
+
+    def test_personal_calendar_window(self):
+        self.assertUsesIndex(Schedule.objects.filter(
+            executor='u1', startTime__lt=self.end, endTime__gt=self.start).order_by('startTime', 'id'))
+
+    def test_team_calendar_window(self):
+        member_name = models.TeamMember.objects.filter(
+            groupID=OuterRef('groupID'), username=OuterRef('executor')).values('memberName')[:1]
+        self.assertUsesIndex(models.GroupSchedule.objects.filter(
+            groupID='g1', startTime__lt=self.end, endTime__gt=self.start).annotate(memberName=Subquery(member_name)))
+
+    def test_group_tasks_of_user(self):
+        group_ids = models.TeamMember.objects.filter(username='u1').values_list('groupID', flat=True)
+        self.assertUsesIndex(models.GroupSchedule.objects.filter(groupID__in=group_ids, executor='u1'))
+        self.assertUsesIndex(models.GroupSchedule.objects.filter(groupID='g1', executor='u1'))
+
+    def test_group_membership(self):
+        self.assertUsesIndex(models.TeamMember.objects.filter(username='u1').values_list('groupID', flat=True))
+        self.assertUsesIndex(models.TeamMember.objects.filter(groupID='g1'))
+        self.assertUsesIndex(models.TeamMember.objects.filter(groupID='g1', username='u1'))
+
+    def test_memos_and_announcements(self):
+        self.assertUsesIndex(models.Memo.objects.filter(username='u1'))
+        self.assertUsesIndex(models.TeamMemo.objects.filter(groupID='g1'))
+        self.assertUsesIndex(models.Announcement.objects.filter(groupID='g1'))
+
+    def test_conflict_candidates(self):
+        schedule = Schedule(executor='u1', resource='会议室', startTime=self.start, endTime=self.end)
+        self.assertUsesIndex(conflict_candidates(Schedule, schedule))
+
+    def test_sync_log(self):
+        group_ids = models.TeamMember.objects.filter(username='u1').values_list('groupID', flat=True)
+        self.assertUsesIndex(models.ChangeLog.objects.filter(
+            Q(username='u1') | Q(groupID__in=group_ids), id__gt=0).order_by('id'))
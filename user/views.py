@@ -8,16 +8,38 @@ from django.shortcuts import render
 from django.contrib.auth.hashers import check_password, make_password
 from django.views.decorators.csrf import csrf_exempt
 from datetime import datetime, timedelta
+from django.conf import settings
 from django.utils import timezone
 from user import models
 from user.utils import post_test
 from .models import Schedule, GroupSchedule
-from .resource.scheduler import genetic_algorithm, check_conflicts
-from .services.parser import ScheduleParser
-from django.db.models import Q
+from .resource.scheduler import check_conflicts, affected_component
+from .resource.solvers import solve
+from .resource.storage import (StaleScheduleError, conflict_candidates, reschedule_candidates, take_snapshot,
+                               write_back)
+from .services.calendar import DEFAULT_PAGE_SIZE, InvalidCursor, calendar_page
+from .services.groups import GroupNotFound, get_group_info_list
+from .services.parser import parser_status, warm_up_parser
+from .services.pool import ParserPoolBusy, pool_status, run_parser
+from .services.sync import DEFAULT_SYNC_LIMIT, changes_since, current_token
+from django.db.models import OuterRef, Q, Subquery
 from .services.asr_json import speech_recognize
 
 
+def timestamp_to_datetime(value):
+    # 前端传秒级时间戳，按东八区转换成库中存储的 naive 时间
+    return datetime.fromtimestamp(value, ZoneInfo("Asia/Shanghai")).replace(tzinfo=None)
+
+
+def filter_window(queryset, data):
+    # 可选的 start / end 时间窗：只返回与窗口有交集的日程
+    if data.get('start') is not None:
+        queryset = queryset.filter(endTime__gt=timestamp_to_datetime(data['start']))
+    if data.get('end') is not None:
+        queryset = queryset.filter(startTime__lt=timestamp_to_datetime(data['end']))
+    return queryset
+
+
 def login(req: HttpRequest):
     if req.method == "POST":
         try:
@@ -78,25 +100,15 @@ def get_group_info(req: HttpRequest):
     if req.method == "POST":
         data = json.loads(req.body)
         try:
-            members = models.TeamMember.objects.filter(username=data['username'])
-            if not members.exists():
+            group_info_list = get_group_info_list(data['username'])
+            if not group_info_list:
                 return JsonResponse({"success": False, "message": "用户未加入任何群组"})
 
-            group_info_list = []
-            for member in members:
-                group = models.TeamGroup.objects.get(groupID=member.groupID)
-                group_info_list.append({
-                    "groupID": group.groupID,
-                    "groupName": group.groupName,
-                    "groupDescription": group.groupDescription,
-                    "groupOwner": group.groupOwner
-                })
-
             return JsonResponse({
                 "success": True,
                 "groupInfo": group_info_list
             })
-        except models.TeamGroup.DoesNotExist:
+        except GroupNotFound:
             return JsonResponse({"success": False, "message": "群组信息不存在"})
         except Exception as e:
             return JsonResponse({"success": False, "message": f"服务器错误: {str(e)}"})
@@ -108,7 +120,7 @@ def get_schedule(req: HttpRequest):
         data = json.loads(req.body)
         try:
             events = []
-            schedules = models.Schedule.objects.filter(executor=data['username'])
+            schedules = filter_window(models.Schedule.objects.filter(executor=data['username']), data)
             for schedule in schedules:
                 events.append({
                     "id": schedule.id,
@@ -124,10 +136,10 @@ def get_schedule(req: HttpRequest):
             user_groups = models.TeamMember.objects.filter(
                 username=data['username']
             ).values_list('groupID', flat=True)
-            group_schedules = models.GroupSchedule.objects.filter(
+            group_schedules = filter_window(models.GroupSchedule.objects.filter(
                 groupID__in=user_groups,
                 executor=data['username']
-            )
+            ), data)
             groups = models.TeamGroup.objects.filter(groupID__in=user_groups)
             group_map = {group.groupID: group for group in groups}
             for group_schedule in group_schedules:
@@ -154,6 +166,53 @@ def get_schedule(req: HttpRequest):
     return JsonResponse({"success": False, "message": "仅支持 POST 请求"}, status=405)
 
 
+def get_calendar(req: HttpRequest):
+    if req.method == "POST":
+        try:
+            data = json.loads(req.body)
+            if not data.get('username'):
+                return JsonResponse({"success": False, 'message': '用户名不能为空'}, status=400)
+            if data.get('start') is None or data.get('end') is None:
+                return JsonResponse({"success": False, 'message': '必须指定 start 和 end'}, status=400)
+            if data.get('class') not in (None, 'personal', 'team'):
+                return JsonResponse({"success": False, 'message': 'class 只能为 personal 或 team'}, status=400)
+
+            page = calendar_page(
+                data['username'],
+                timestamp_to_datetime(data['start']),
+                timestamp_to_datetime(data['end']),
+                state=int(data['state']) if data.get('state') is not None else None,
+                priority=int(data['priority']) if data.get('priority') is not None else None,
+                schedule_class=data.get('class'),
+                cursor=data.get('cursor'),
+                limit=int(data.get('limit', DEFAULT_PAGE_SIZE)),
+            )
+            return JsonResponse({"success": True, **page})
+        except InvalidCursor as e:
+            return JsonResponse({"success": False, 'message': str(e)}, status=400)
+        except Exception as e:
+            return JsonResponse({"success": False, "message": f"服务器错误: {str(e)}"})
+    return JsonResponse({"success": False, "message": "仅支持 POST 请求"}, status=405)
+
+
+def sync(req: HttpRequest):
+    if req.method == "POST":
+        try:
+            data = json.loads(req.body)
+            if not data.get('username'):
+                return JsonResponse({"success": False, 'message': '用户名不能为空'}, status=400)
+            # 没有令牌的客户端先全量拉取，再从当前令牌开始增量同步
+            if data.get('token') is None:
+                return JsonResponse({"success": True, "token": current_token(), "has_more": False, "changes": [],
+                                     "reset": True})
+            changes = changes_since(data['username'], int(data['token']),
+                                    limit=int(data.get('limit', DEFAULT_SYNC_LIMIT)))
+            return JsonResponse({"success": True, **changes})
+        except Exception as e:
+            return JsonResponse({"success": False, "message": f"服务器错误: {str(e)}"})
+    return JsonResponse({"success": False, "message": "仅支持 POST 请求"}, status=405)
+
+
 def update_schedule(req: HttpRequest):
     if req.method == "POST":
         data = json.loads(req.body)
@@ -251,9 +310,10 @@ def get_all_tasks(request):
         if not username:
             return JsonResponse({"success": False, 'message': '用户名不能为空'})
 
-        personal_tasks = list(Schedule.objects.filter(executor=username).values())
+        personal_tasks = list(filter_window(Schedule.objects.filter(executor=username), data).values())
         group_ids = models.TeamMember.objects.filter(username=username).values_list('groupID', flat=True)
-        group_tasks = list(GroupSchedule.objects.filter(groupID__in=group_ids, executor=username).values())
+        group_tasks = list(filter_window(GroupSchedule.objects.filter(groupID__in=group_ids, executor=username),
+                                         data).values())
 
         all_tasks = personal_tasks + group_tasks
         return JsonResponse({"success": True, 'data': all_tasks})
@@ -268,7 +328,7 @@ def get_personal_tasks(request):
         if not username:
             return JsonResponse({"success": False, 'message': '用户名不能为空'})
 
-        tasks = list(Schedule.objects.filter(executor=username).values())
+        tasks = list(filter_window(Schedule.objects.filter(executor=username), data).values())
         return JsonResponse({"success": True, 'data': tasks})
     except Exception as e:
         return JsonResponse({"success": False, 'message': str(e)})
@@ -798,11 +858,17 @@ def get_schedule_info(req: HttpRequest):
     if req.method == "POST":
         data = json.loads(req.body)
         try:
-            schedules = models.GroupSchedule.objects.filter(groupID=data['groupID'])
+            # 执行人的群昵称用子查询一并取出，避免每条日程再查一次 TeamMember
+            member_name = models.TeamMember.objects.filter(
+                groupID=OuterRef('groupID'), username=OuterRef('executor')
+            ).values('memberName')[:1]
+            schedules = filter_window(models.GroupSchedule.objects.filter(groupID=data['groupID']), data)
+            if data.get('state') is not None:
+                schedules = schedules.filter(state=int(data['state']))
+            schedules = schedules.annotate(memberName=Subquery(member_name))
 
             schedule_list = []
             for schedule in schedules:
-                member = models.TeamMember.objects.get(username=schedule.executor, groupID=schedule.groupID)
                 schedule_list.append({
                     "id": schedule.id,
                     "content": schedule.scheduleContent,
@@ -811,7 +877,7 @@ def get_schedule_info(req: HttpRequest):
                     "resource": schedule.resource,
                     "priority": schedule.priority,
                     "state": schedule.state,
-                    "executor": member.memberName
+                    "executor": schedule.memberName
                 })
 
             return JsonResponse({
@@ -825,29 +891,65 @@ def get_schedule_info(req: HttpRequest):
     return JsonResponse({"success": False, "message": "仅支持 POST 请求"}, status=405)
 
 
+def smart_input_data(result):
+    return {
+        'content': result['scheduleContent'],
+        'startTime': result['startTime'],
+        'endTime': result['endTime'],
+        'priority': result['priority'],
+        'resources': result['resource'],
+        'extractionTier': result['extractionTier']
+    }
+
+
 def smart_input(req: HttpRequest):
     if req.method == "POST":
         data = json.loads(req.body)
         try:
             text = data.get('text')
+            texts = data.get('texts')
             executor = data.get('username')
+            # 以用户所在时区的当前时间作为“今天”“明天”等相对日期的参考
+            now = datetime.now(ZoneInfo(data.get('timezone', 'Asia/Shanghai'))).replace(tzinfo=None)
+            if texts is not None:
+                # 批量模式：逐条返回解析结果或错误信息，顺序与输入一致
+                if not isinstance(texts, list) or not texts:
+                    return JsonResponse({'error': 'texts必须是非空列表'}, status=400)
+                if len(texts) > settings.SMART_INPUT_BATCH_LIMIT:
+                    return JsonResponse({'error': f'单次最多解析{settings.SMART_INPUT_BATCH_LIMIT}条'}, status=400)
+                results = run_parser('parse_many', texts, executor, now=now)
+                return JsonResponse({'success': True, 'data': [
+                    {'success': True, 'data': smart_input_data(item['data'])} if item['success'] else item
+                    for item in results
+                ]})
             if not text:
                 return JsonResponse({'error': 'Text不能为空'}, status=400)
-            parser = ScheduleParser()
-            result = parser.parse(text, executor)
-
-            return JsonResponse({'success': True, 'data': {
-                'content': result['scheduleContent'],
-                'startTime': result['startTime'],
-                'endTime': result['endTime'],
-                'priority': result['priority'],
-                'resources': result['resource']
-            }})
+            result = run_parser('parse', text, executor, now=now)
+
+            return JsonResponse({'success': True, 'data': smart_input_data(result)})
+        except ParserPoolBusy as e:
+            # 解析进程池已满或超时：立即拒绝，不占住 Web worker
+            response = JsonResponse({'success': False, 'message': str(e)}, status=503)
+            response['Retry-After'] = '1'
+            return response
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=400)
     return JsonResponse({"success": False, "message": "仅支持 POST 请求"}, status=405)
 
 
+def smart_input_status(req: HttpRequest):
+    # 启用进程池时由池中的 worker 解析，Web 进程中的解析器不代表服务状态，只报告进程池健康状况
+    pool = pool_status()
+    if pool is not None:
+        return JsonResponse({"success": pool["ready"], "pool": pool}, status=200 if pool["ready"] else 503)
+    status = parser_status()
+    if status["status"] == "cold":
+        # 未开启启动预热时由首次状态查询触发后台加载，就绪探针不必等到第一条真实请求
+        warm_up_parser()
+    return JsonResponse({"success": status["ready"], "parser": status, "pool": None},
+                        status=200 if status["ready"] else 503)
+
+
 def recognize_audio(request):
     if request.method == 'POST':
         data = json.loads(request.body)
@@ -885,7 +987,7 @@ def add_schedule(req: HttpRequest):
                     priority=priority,
                     state=0,
                 )
-                existing_schedules = list(GroupSchedule.objects.all())
+                existing_schedules = list(conflict_candidates(GroupSchedule, new_schedule))
             elif schedule_class == "personal":
                 new_schedule = Schedule(
                     scheduleContent=content,
@@ -896,7 +998,7 @@ def add_schedule(req: HttpRequest):
                     priority=priority,
                     state=0,
                 )
-                existing_schedules = list(Schedule.objects.all())
+                existing_schedules = list(conflict_candidates(Schedule, new_schedule))
 
             conflicts = check_conflicts(existing_schedules, new_schedule)
             if conflicts:
@@ -938,7 +1040,7 @@ def adjust_schedule(req: HttpRequest):
                     priority=priority,
                     state=0,
                 )
-                existing_schedules = list(GroupSchedule.objects.all())
+                existing_schedules = reschedule_candidates(GroupSchedule, new_schedule)
             elif schedule_class == "personal":
                 new_schedule = Schedule(
                     scheduleContent=content,
@@ -949,23 +1051,22 @@ def adjust_schedule(req: HttpRequest):
                     priority=priority,
                     state=0,
                 )
-                existing_schedules = list(Schedule.objects.all())
-
-            optimized_schedules = genetic_algorithm(existing_schedules, new_schedule)
-
-            original_ids = set(s.id for s in existing_schedules if hasattr(s, "id"))
-
-            for schedule in optimized_schedules:
-                if not hasattr(schedule, "id") or schedule.id not in original_ids:
-                    schedule.save()
-                else:
-                    db_schedule = GroupSchedule.objects.get(id=schedule.id)
-                    if db_schedule.startTime != schedule.startTime or db_schedule.endTime != schedule.endTime:
-                        db_schedule.startTime = schedule.startTime
-                        db_schedule.endTime = schedule.endTime
-                        db_schedule.save()
+                existing_schedules = reschedule_candidates(Schedule, new_schedule)
+
+            # 只优化与新日程处于同一冲突连通分量的日程，其余日程保持不变
+            existing_schedules, _ = affected_component(existing_schedules, new_schedule)
+            snapshot = take_snapshot(existing_schedules)
+            optimized_schedules = solve(
+                existing_schedules, new_schedule,
+                solver=settings.SCHEDULER_SOLVER,
+                backend=settings.SCHEDULER_BACKEND,
+                workers=settings.SCHEDULER_WORKERS,
+            )
+            write_back(type(new_schedule), optimized_schedules, snapshot)
 
             return JsonResponse({"success": True, "message": "日程调整成功"})
+        except StaleScheduleError:
+            return JsonResponse({"success": False, "message": "相关日程已被修改，请刷新后重试"}, status=409)
         except Exception as e:
             return JsonResponse({"success": False, "message": f"服务器错误: {str(e)}"}, status=500)
     return JsonResponse({"success": False, "message": "仅支持 POST 请求"}, status=405)